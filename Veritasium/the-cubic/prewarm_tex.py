@@ -0,0 +1,351 @@
+import argparse
+import ast
+import glob
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from manimlib.logger import log
+from manimlib.mobject.svg.text_mobject import Text
+from manimlib.utils.directories import get_tex_dir
+from manimlib.utils.tex_file_writing import get_tex_config
+from manimlib.utils.tex_file_writing import tex_hash
+
+# Compiles the Tex of the scene files ahead of the render, in multi-page
+# LaTeX documents run side by side, and leaves each page where
+# tex_to_svg_file looks for it. Text gets laid out the same way. Run from
+# this directory, so custom_config.yml is used:
+#
+#   python prewarm_tex.py
+#   python prewarm_tex.py scenes/formulas.py _NO__
+
+SCENES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenes")
+
+# What LazyTex sends to the background is what gets compiled here
+sys.path.insert(0, SCENES_DIR)
+from tex_cache import get_tex_file_bodies
+
+# Keyword arguments that change the files Tex and Text write. LazyTex
+# compiles what Tex would
+TEX_KWARGS = ["arg_separator", "isolate", "tex_to_color_map", "alignment", "math_mode"]
+MOBJECT_KWARGS = {
+    "Tex": TEX_KWARGS,
+    "LazyTex": TEX_KWARGS,
+    "Text": [
+        "font",
+        "font_size",
+        "size",
+        "slant",
+        "weight",
+        "lsh",
+        "line_spacing_height",
+        "tab_width",
+        "t2f",
+        "t2s",
+        "t2w",
+        "text2font",
+        "text2slant",
+        "text2weight",
+    ],
+}
+
+# What evaluate accepts: literals, names, arithmetic and f-strings, no calls
+EVALUATE_NODES = (
+    ast.Expression,
+    ast.Constant,
+    ast.Name,
+    ast.Load,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.operator,
+    ast.unaryop,
+    ast.JoinedStr,
+    ast.FormattedValue,
+    ast.List,
+    ast.Tuple,
+    ast.Dict,
+)
+
+
+def get_calls(file_name, scene_names=None):
+    # Finds the Tex(...), LazyTex(...) and Text(...) calls whose arguments can
+    # be worked out without running the scene, so literals and f-strings over
+    # local constants
+    with open(file_name, "r") as file:
+        tree = ast.parse(file.read())
+    if scene_names:
+        roots = [
+            node
+            for node in tree.body
+            if isinstance(node, ast.ClassDef) and node.name in scene_names
+        ]
+    else:
+        roots = [tree]
+
+    module_constants = get_constants(tree.body)
+    scopes = [] if scene_names else [(tree, module_constants)]
+    for root in roots:
+        for node in ast.walk(root):
+            if isinstance(node, ast.FunctionDef):
+                constants = dict(module_constants, **get_constants(node.body))
+                scopes.append((node, constants))
+
+    calls = []
+    seen = set()
+    # Inner scopes go last, so their constants win for the calls they hold
+    for scope, constants in reversed(scopes):
+        for node in ast.walk(scope):
+            if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+                continue
+            if node.func.id not in MOBJECT_KWARGS or node in seen:
+                continue
+            seen.add(node)
+            try:
+                args = [evaluate(arg, constants) for arg in node.args]
+                kwargs = {
+                    kw.arg: get_kwarg_value(kw.arg, kw.value, constants)
+                    for kw in node.keywords
+                    if kw.arg in MOBJECT_KWARGS[node.func.id]
+                }
+            except (ValueError, NameError, TypeError, ArithmeticError):
+                continue
+            if all(isinstance(arg, str) for arg in args):
+                calls.append((node.func.id, args, kwargs))
+    return calls
+
+
+def get_constants(body):
+    # Names assigned exactly once in these statements, to something that
+    # evaluate can work out
+    assignments = {}
+    for node in iter_scope(body):
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, (ast.AugAssign, ast.AnnAssign, ast.For)):
+            targets = [node.target]
+        else:
+            continue
+        for target in targets:
+            for name in ast.walk(target):
+                if isinstance(name, ast.Name):
+                    # Only plain "name = value" counts, anything else rules it out
+                    simple = isinstance(node, ast.Assign) and target is name
+                    assignments.setdefault(name.id, []).append(
+                        node.value if simple else None
+                    )
+
+    constants = {}
+    for name, values in assignments.items():
+        if len(values) != 1 or values[0] is None:
+            continue
+        try:
+            constants[name] = evaluate(values[0], constants)
+        except (ValueError, NameError, TypeError, ArithmeticError):
+            pass
+    return constants
+
+
+def iter_scope(body):
+    # The nodes of these statements in source order, leaving out the ones
+    # of nested functions and classes
+    for statement in body:
+        yield statement
+        for child in ast.iter_child_nodes(statement):
+            if not isinstance(child, (ast.FunctionDef, ast.ClassDef)):
+                yield from iter_scope([child])
+
+
+def evaluate(node, constants):
+    # Like ast.literal_eval, but also takes names from constants, arithmetic
+    # and f-strings
+    for child in ast.walk(node):
+        if not isinstance(child, EVALUATE_NODES):
+            raise ValueError(f"Can't evaluate {type(child).__name__}")
+        if isinstance(child, ast.Name) and child.id not in constants:
+            raise NameError(child.id)
+    expression = ast.fix_missing_locations(ast.Expression(node))
+    return eval(
+        compile(expression, "<prewarm>", "eval"), {"__builtins__": {}}, constants
+    )
+
+
+def get_kwarg_value(name, node, constants):
+    if name == "tex_to_color_map" and isinstance(node, ast.Dict):
+        # Only the keys matter for the tex files, the colors can be anything
+        return {evaluate(key, constants): None for key in node.keys}
+    return evaluate(node, constants)
+
+
+def get_svg_file(body):
+    return os.path.join(get_tex_dir(), tex_hash(body) + ".svg")
+
+
+def get_missing_bodies(bodies):
+    return [
+        body for body in dict.fromkeys(bodies) if not os.path.exists(get_svg_file(body))
+    ]
+
+
+def compile_tex_batch(bodies):
+    # Returns how many of the bodies got compiled
+    bodies = get_missing_bodies(bodies)
+    if not bodies:
+        return 0
+
+    template = get_tex_config()["tex_body"]
+    preamble = template.split("\\begin{document}")[0]
+    if "{standalone}" not in preamble:
+        log.warning("The Tex template isn't a standalone document, can't batch it")
+        return 0
+    # Each standalone environment becomes its own page, cropped like a
+    # document of its own would be
+    preamble = re.sub(
+        r"\\documentclass(\[(.*?)\])?\{standalone\}",
+        lambda match: "\\documentclass[{}]{{standalone}}".format(
+            ",".join(filter(None, [match.group(2), "multi"]))
+        ),
+        preamble,
+    )
+    pages = [
+        body.split("\\begin{document}")[1].split("\\end{document}")[0]
+        for body in bodies
+    ]
+    document = "".join([
+        preamble,
+        "\\begin{document}\n",
+        *("\\begin{standalone}\n" + page + "\n\\end{standalone}\n" for page in pages),
+        "\\end{document}\n",
+    ])
+
+    tex_dir = get_tex_dir()
+    stem = os.path.join(tex_dir, "batch_" + tex_hash(document))
+    with open(stem + ".tex", "w", encoding="utf-8") as outfile:
+        outfile.write(document)
+    commands = [
+        get_tex_config()["executable"],
+        "-interaction=batchmode",
+        "-halt-on-error",
+        f"-output-directory=\"{tex_dir}\"",
+        f"\"{stem}.tex\"",
+        ">",
+        os.devnull,
+    ]
+    exit_code = os.system(" ".join(commands))
+    if exit_code == 0:
+        commands = [
+            "dvisvgm",
+            f"\"{stem}.dvi\"",
+            "-n",
+            "-v",
+            "0",
+            "-p",
+            "1-",
+            "-o",
+            f"\"{stem}-%p.svg\"",
+            ">",
+            os.devnull,
+        ]
+        os.system(" ".join(commands))
+
+    page_files = {
+        int(re.search(r"-(\d+)\.svg$", file_name).group(1)): file_name
+        for file_name in glob.glob(stem + "-*.svg")
+    }
+    if exit_code != 0 or len(page_files) != len(bodies):
+        log.warning(
+            "Couldn't compile the Tex as one document, "
+            "it will get compiled string by string while rendering"
+        )
+        compiled = 0
+    else:
+        for index, body in enumerate(bodies):
+            os.replace(page_files[index + 1], get_svg_file(body))
+        compiled = len(bodies)
+
+    for file_name in glob.glob(stem + "*"):
+        os.remove(file_name)
+    return compiled
+
+
+def prewarm_text(text, kwargs):
+    # Text keeps its own svg cache, laying it out once is enough to fill it
+    Text(text, **kwargs)
+
+
+def prewarm(calls, processes=None):
+    # Splits the missing tex files in one batch per process, and lays out the
+    # Text next to them. Returns how many tex files got compiled
+    processes = processes or os.cpu_count()
+    bodies = []
+    texts = []
+    for name, args, kwargs in calls:
+        if name in ["Tex", "LazyTex"]:
+            bodies += get_tex_file_bodies(args, kwargs)
+        else:
+            texts += [(text, kwargs) for text in args]
+    bodies = get_missing_bodies(bodies)
+    # Striding keeps the long formulas of a scene spread across the batches
+    batches = [bodies[i::processes] for i in range(processes)]
+    batches = [batch for batch in batches if batch]
+
+    with ProcessPoolExecutor(processes) as pool:
+        tex_futures = [pool.submit(compile_tex_batch, batch) for batch in batches]
+        text_futures = [
+            pool.submit(prewarm_text, text, kwargs) for text, kwargs in texts
+        ]
+        compiled = 0
+        for batch, future in zip(batches, tex_futures):
+            if future.exception() is not None:
+                log.warning(
+                    f"Couldn't compile {len(batch)} tex files: {future.exception()}"
+                )
+            else:
+                compiled += future.result()
+        for (text, kwargs), future in zip(texts, text_futures):
+            if future.exception() is not None:
+                log.warning(
+                    f"Couldn't lay out {text.strip()[:20]!r}: {future.exception()}"
+                )
+    return compiled
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile the Tex of the scene files before rendering them"
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        help="Scene file to take the Tex from, all of the scenes folder if not given",
+    )
+    parser.add_argument(
+        "scene_names", nargs="*", help="Only take the Tex of these scenes"
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        help="How many LaTeX runs to have at once, one per cpu by default",
+    )
+    args = parser.parse_args()
+
+    if args.file:
+        calls = get_calls(args.file, args.scene_names)
+    else:
+        calls = [
+            call
+            for file_name in sorted(glob.glob(os.path.join(SCENES_DIR, "*.py")))
+            for call in get_calls(file_name)
+        ]
+    tex_files = {
+        body
+        for name, tex_strings, kwargs in calls
+        if name in ["Tex", "LazyTex"]
+        for body in get_tex_file_bodies(tex_strings, kwargs)
+    }
+    compiled = prewarm(calls, args.processes)
+    log.info(f"Compiled {compiled} of {len(tex_files)} tex files")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,112 +1,22 @@
+import os
+import sys
 from inspect import getinnerframes, iscode
 from typing import final
 from manimlib import *
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tex_cache import Tex, LazyTex, LazyTexScene
+from transform_matching import TransformMatchingChainJ, TransformMatchingTexJ
 
-class TransformMatchingPartsJ(AnimationGroup):
-    CONFIG = {
-        "mobject_type": Mobject,
-        "group_type": Group,
-        "transform_mismatches": False,
-        "fade_transform_mismatches": False,
-        "key_map": dict(),
-    }
-
-    def __init__(self, mobject, target_mobject, **kwargs):
-        digest_config(self, kwargs)
-        assert isinstance(mobject, self.mobject_type)
-        assert isinstance(target_mobject, self.mobject_type)
-        source_map = self.get_shape_map(mobject)
-        target_map = self.get_shape_map(target_mobject)
-
-        # Create two mobjects whose submobjects all match each other
-        # according to whatever keys are used for source_map and
-        # target_map
-        transform_source = self.group_type()
-        transform_target = self.group_type()
-        kwargs["final_alpha_value"] = 0
-        for key in set(source_map).intersection(target_map):
-            transform_source.add(source_map[key])
-            transform_target.add(target_map[key])
-        anims = [FadeTransformPieces(transform_source, transform_target, **kwargs)]
-        # User can manually specify when one part should transform
-        # into another despite not matching by using key_map
-        key_mapped_source = self.group_type()
-        key_mapped_target = self.group_type()
-        for key1, key2 in self.key_map.items():
-            if key1 in source_map and key2 in target_map:
-                key_mapped_source.add(source_map[key1])
-                key_mapped_target.add(target_map[key2])
-                source_map.pop(key1, None)
-                target_map.pop(key2, None)
-        if len(key_mapped_source) > 0:
-            anims.append(
-                FadeTransformPieces(
-                    key_mapped_source,
-                    key_mapped_target,
-                )
-            )
-
-        fade_source = self.group_type()
-        fade_target = self.group_type()
-        for key in set(source_map).difference(target_map):
-            fade_source.add(source_map[key])
-        for key in set(target_map).difference(source_map):
-            fade_target.add(target_map[key])
-
-        if self.transform_mismatches:
-            anims.append(FadeTransformPieces(fade_source.copy(), fade_target, **kwargs))
-        if self.fade_transform_mismatches:
-            anims.append(FadeTransformPieces(fade_source, fade_target, **kwargs))
-        else:
-            anims.append(FadeOut(fade_source, DOWN, **kwargs))
-            anims.append(FadeIn(fade_target.copy(), DOWN, **kwargs))
-
-        super().__init__(*anims)
-
-        self.to_remove = mobject
-        self.to_add = target_mobject
-
-    def get_shape_map(self, mobject):
-        shape_map = {}
-        for sm in self.get_mobject_parts(mobject):
-            key = self.get_mobject_key(sm)
-            if key not in shape_map:
-                shape_map[key] = VGroup()
-            shape_map[key].add(sm)
-        return shape_map
-
-    def clean_up_from_scene(self, scene):
-        for anim in self.animations:
-            anim.update(0)
-        scene.remove(self.mobject)
-        scene.remove(self.to_remove)
-        scene.add(self.to_add)
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        # To be implemented in subclass
-        return mobject
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        # To be implemented in subclass
-        return hash(mobject)
-
-
-class TransformMatchingTexJ(TransformMatchingPartsJ):
-    CONFIG = {
-        "mobject_type": VMobject,
-        "group_type": VGroup,
-    }
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        return mobject.submobjects
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        return mobject.get_tex()
+# The transforms of these formulas fade every part into its match rather
+# than morphing it, and fade what's left downwards. Repeated parts, like the
+# 2s and +s of the last steps, go to the nearest copy in the next formula
+PIECES_TRANSFORM_CONFIG = {
+    "transform_class": FadeTransformPieces,
+    "key_map_transform_class": FadeTransformPieces,
+    "fade_direction": DOWN,
+    "match_duplicates_by_distance": True,
+}
 
 
 class BombellisFormulaSolutionGrind(Scene):
@@ -171,68 +81,80 @@ class BombellisFormulaSolutionGrind(Scene):
 
         self.wait(1)
 
+        # Each formula's parts get keyed once, for both steps it's in
+        simplify = TransformMatchingChainJ(
+            eq_1, sustitution, simplify_1, separation, **PIECES_TRANSFORM_CONFIG
+        )
+        expand = TransformMatchingChainJ(
+            cube_sides,
+            equals,
+            simplify_2,
+            separate_equations,
+            separate_equations_2,
+            separate_equations_3,
+            meaning,
+            final_step,
+            key_maps={
+                0: {
+                    R"(a+b\sqrt{-1})(a+b\sqrt{-1})(a+b\sqrt{-1})": R"(a^2+2ab\sqrt{-1}+b^2(\sqrt{-1})^2)(a+b\sqrt{-1})"
+                }
+            },
+            **PIECES_TRANSFORM_CONFIG,
+        )
+
         time = 4
 
         self.play(Write(eq_1))
         self.wait(time)
-        self.play(TransformMatchingTexJ(eq_1, sustitution))
+        self.play(simplify[0])
         self.wait(time)
-        self.play(TransformMatchingTexJ(sustitution, simplify_1))
+        self.play(simplify[1])
         self.wait(time)
-        self.play(TransformMatchingTexJ(simplify_1, separation))
+        self.play(simplify[2])
         self.wait(time)
 
         self.play(TransformMatchingShapes(separation, cube_sides))
         self.wait(time)
 
-        self.play(
-            TransformMatchingTexJ(
-                cube_sides,
-                equals,
-                key_map={
-                    "(a+b\sqrt{-1})(a+b\sqrt{-1})(a+b\sqrt{-1})": "(a^2+2ab\sqrt{-1}+b^2(\sqrt{-1})^2)(a+b\sqrt{-1})"
-                },
-            )
-        )
+        self.play(expand[0])
         self.wait(time)
-
-        self.play(TransformMatchingTexJ(equals, simplify_2))
+        self.play(expand[1])
         self.wait(time)
-        self.play(TransformMatchingTexJ(simplify_2, separate_equations))
+        self.play(expand[2])
         self.wait(time)
-        self.play(TransformMatchingTexJ(separate_equations, separate_equations_2))
+        self.play(expand[3])
         self.wait(time)
-        self.play(TransformMatchingTexJ(separate_equations_2, separate_equations_3))
+        self.play(expand[4])
         self.wait(time)
-        self.play(TransformMatchingTexJ(separate_equations_3, meaning))
+        self.play(expand[5])
         self.wait(time)
-        self.play(TransformMatchingTexJ(meaning, final_step))
+        self.play(expand[6])
 
 
-class BombellisFormulaSolutionSlideShow(Scene):
+class BombellisFormulaSolutionSlideShow(LazyTexScene):
     def construct(self):
 
         quadratic = (
-            Tex(R"x^2=15x+4 \rightarrow ax^2 = bx + c")
+            LazyTex(R"x^2=15x+4 \rightarrow ax^2 = bx + c")
             .set_color(BLACK)
             .scale(1)
             .to_corner(UL)
         )
-        eq_1 = Tex(
+        eq_1 = LazyTex(
             R"\sqrt[3]{\frac d2+\sqrt{\frac{d^2}4-\frac{c^3}{27}}}",
             R"+\sqrt[3]{\frac d2-\sqrt{\frac{d^2}4-\frac{c^3}{27}}}",
         ).set_color(BLACK)
 
-        sustitution = Tex(
+        sustitution = LazyTex(
             R"\sqrt[3]{\frac 42+\sqrt{\frac{4^2}4-\frac{15^3}{27}}}",
             R"+\sqrt[3]{\frac 42-\sqrt{\frac{4^2}4-\frac{15^3}{27}}}",
         ).set_color(BLACK)
 
-        simplify_1 = Tex(
+        simplify_1 = LazyTex(
             R"\sqrt[3]{2+\sqrt{4-125}} +\sqrt[3]{2-\sqrt{4-125}}"
         ).set_color(BLACK)
 
-        separation = Tex(
+        separation = LazyTex(
             R"\sqrt[3]{ ",
             R"2 + \sqrt{-121}",
             "}",
@@ -240,33 +162,35 @@ class BombellisFormulaSolutionSlideShow(Scene):
             R"a + b \sqrt{-11} ",
         ).set_color(BLACK)
 
-        cube_sides = Tex(
+        cube_sides = LazyTex(
             R"2 + \sqrt{-121}", "=", R"(a+b\sqrt{-1})(a+b\sqrt{-1})(a+b\sqrt{-1})"
         ).set_color(BLACK)
 
-        equals = Tex(R"(a^2+2ab\sqrt{-1}+b^2(\sqrt{-1})^2)(a+b\sqrt{-1})").set_color(
-            BLACK
-        )
+        equals = LazyTex(
+            R"(a^2+2ab\sqrt{-1}+b^2(\sqrt{-1})^2)(a+b\sqrt{-1})"
+        ).set_color(BLACK)
 
-        simplify_2 = Tex(
+        simplify_2 = LazyTex(
             R"2+\sqrt{-121} = a^3-3ab^2+3a^2b\sqrt{-1}-b^3\sqrt{-1}"
         ).set_color(BLACK)
 
-        separate_equations = Tex(
+        separate_equations = LazyTex(
             R"2=a^3-3ab^2 \\ \sqrt{-121}=3a^2b\sqrt{-1}-b^3\sqrt{-1}"
         ).set_color(BLACK)
 
-        separate_equations_2 = Tex(
+        separate_equations_2 = LazyTex(
             R"11 \sqrt{-1} =b \sqrt{-1}(3a^2-b^2) \\ 11=b(3a^2-b^2)"
         ).set_color(BLACK)
 
-        separate_equations_3 = Tex(R"2=a^3-3ab^2 \\ 11=b(3a^2-b^2)").set_color(BLACK)
+        separate_equations_3 = LazyTex(R"2=a^3-3ab^2 \\ 11=b(3a^2-b^2)").set_color(
+            BLACK
+        )
 
-        meaning = Tex(
+        meaning = LazyTex(
             R"\sqrt[3]{2+\sqrt{-121}}=2+\sqrt{-1} \\ \sqrt[3]{2-\sqrt{-121}}=2-\sqrt{-1}"
         ).set_color(BLACK)
 
-        final_step_1 = Tex(
+        final_step_1 = LazyTex(
             R"(2 + \sqrt{-1}) + (2 - \sqrt{-1})=4", isolate=["2", "+", "=", "4"]
         ).set_color(BLACK)
 
@@ -284,9 +208,9 @@ class BombellisFormulaSolutionSlideShow(Scene):
                 separate_equations_2,
                 separate_equations_3,
                 meaning,
-                Tex(""),
-                Tex(""),
-                Tex(""),
+                LazyTex(""),
+                LazyTex(""),
+                LazyTex(""),
                 final_step_1,
             )
             .arrange(DOWN, buff=2)
@@ -295,14 +219,14 @@ class BombellisFormulaSolutionSlideShow(Scene):
         )
 
         final_step_2 = (
-            Tex(R"2 + 2 = 4", isolate=["2", "+", "=", "4"])
+            LazyTex(R"2 + 2 = 4", isolate=["2", "+", "=", "4"])
             .set_color(BLACK)
             .move_to(final_step_1)
             .scale(1.5)
         )
 
         final_step_3 = (
-            Tex(R"4 = 4", isolate=["="])
+            LazyTex(R"4 = 4", isolate=["="])
             .set_color(BLACK)
             .move_to(final_step_1)
             .scale(1.5)
@@ -321,7 +245,12 @@ class BombellisFormulaSolutionSlideShow(Scene):
             final_step_1.animate.scale(1.5),
         )
 
-        self.play(TransformMatchingTexJ(final_step_1, final_step_2), run_time=3)
+        self.play(
+            TransformMatchingTexJ(
+                final_step_1, final_step_2, **PIECES_TRANSFORM_CONFIG
+            ),
+            run_time=3,
+        )
         self.wait(2)
 
 
@@ -1,5 +1,10 @@
+import os
+import sys
 from manimlib import *
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tex_cache import Tex
+
 
 class ComplexMultiplication(Scene):
     def construct(self):
@@ -10,9 +15,17 @@ class ComplexMultiplication(Scene):
 
         dot = Dot(nl.n2p(3)).set_color(BLUE_D)
         dot_negative = Dot(nl.n2p(-3)).set_color(BLUE_D)
-        tex_dot = Tex("3").set_color(BLUE_D).scale(0.6).next_to(dot, UR, buff=0.1)
+        tex_dot = (
+            DecimalNumber(3, num_decimal_places=0)
+            .set_color(BLUE_D)
+            .scale(0.6)
+            .next_to(dot, UR, buff=0.1)
+        )
         tex_dot_negative = (
-            Tex("-3").set_color(BLUE_D).scale(0.6).next_to(dot_negative, UR, buff=0.1)
+            DecimalNumber(-3, num_decimal_places=0)
+            .set_color(BLUE_D)
+            .scale(0.6)
+            .next_to(dot_negative, UR, buff=0.1)
         )
 
         self.play(Write(nl), run_time=2)
@@ -116,7 +129,7 @@ class ComplexMultiplication(Scene):
             next_number = curr_number * 1j
             new_dot = Dot(c_plane.n2p(next_number)).set_color(BLUE_D)
             new_tex = (
-                Tex(str(f"{next_number:.0f}").replace("j", "i"))
+                DecimalNumber(next_number, num_decimal_places=0)
                 .scale(0.6)
                 .set_color(BLUE_D)
                 .set_stroke("#FFF4D7", width=10, background=True)
@@ -139,7 +152,7 @@ class ComplexMultiplication(Scene):
 
         last_dot = Dot(c_plane.n2p(complex(3))).set_color(BLUE_D)
         last_tex = (
-            Tex("3 + 0i")
+            DecimalNumber(complex(3), num_decimal_places=0)
             .scale(0.6)
             .set_color(BLUE_D)
             .set_stroke("#FFF4D7", width=10, background=True)
@@ -1,3 +1,6 @@
+import os
+import sys
+from collections import OrderedDict
 from functools import update_wrapper
 from math import exp
 from typing import final
@@ -5,6 +8,40 @@ from manimlib import *
 from numpy import cbrt, sqrt
 from typing import Optional
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tex_cache import Tex, LazyTex, LazyTexScene
+from transform_matching import TransformMatchingTexJ
+
+
+# Faces of CachedCube and CachedPrism by their dimensions and squares, so a
+# box built again copies them instead of sampling its surfaces, least
+# recently used first
+BOX_FACES = OrderedDict()
+BOX_FACES_SIZE = 64
+
+
+def init_cached_box(box, dimensions, init_points):
+    key = (tuple(dimensions), tuple(box.square_resolution), box.square_class)
+    if key in BOX_FACES:
+        BOX_FACES.move_to_end(key)
+        box.add(*(face.copy() for face in BOX_FACES[key]))
+        return
+    init_points()
+    BOX_FACES[key] = [face.copy() for face in box.submobjects]
+    if len(BOX_FACES) > BOX_FACES_SIZE:
+        BOX_FACES.popitem(last=False)
+
+
+class CachedCube(Cube):
+    def init_points(self):
+        init_cached_box(self, [self.side_length] * 3, super().init_points)
+
+
+class CachedPrism(Prism):
+    def init_points(self):
+        init_cached_box(self, self.dimensions, super().init_points)
+
+
 # x^3 = 15x + 4
 # x^3 = cx + d
 class Cross(VGroup):
@@ -25,135 +62,6 @@ class Cross(VGroup):
         self.set_stroke(color=stroke_color, width=stroke_width)
 
 
-class TransformMatchingPartsJ(AnimationGroup):
-    CONFIG = {
-        "mobject_type": Mobject,
-        "group_type": Group,
-        "transform_mismatches": False,
-        "fade_transform_mismatches": False,
-        "fade_direction": ORIGIN,
-        "key_map": dict(),
-    }
-
-    def __init__(self, mobject, target_mobject, **kwargs):
-        digest_config(self, kwargs)
-        assert isinstance(mobject, self.mobject_type)
-        assert isinstance(target_mobject, self.mobject_type)
-        source_map = self.get_shape_map(mobject)
-        target_map = self.get_shape_map(target_mobject)
-
-        # Create two mobjects whose submobjects all match each other
-        # according to whatever keys are used for source_map and
-        # target_map
-        transform_source = self.group_type()
-        transform_target = self.group_type()
-        kwargs["final_alpha_value"] = 0
-        for key in set(source_map).intersection(target_map):
-            transform_source.add(source_map[key])
-            transform_target.add(target_map[key])
-        anims = [Transform(transform_source, transform_target, **kwargs)]
-        # User can manually specify when one part should transform
-        # into another despite not matching by using key_map
-        key_mapped_source = self.group_type()
-        key_mapped_target = self.group_type()
-        for key1, key2 in self.key_map.items():
-            if key1 in source_map and key2 in target_map:
-                key_mapped_source.add(source_map[key1])
-                key_mapped_target.add(target_map[key2])
-                source_map.pop(key1, None)
-                target_map.pop(key2, None)
-        if len(key_mapped_source) > 0:
-            anims.append(
-                Transform(
-                    key_mapped_source,
-                    key_mapped_target,
-                )
-            )
-
-        fade_source = self.group_type()
-        fade_target = self.group_type()
-        for key in set(source_map).difference(target_map):
-            fade_source.add(source_map[key])
-        for key in set(target_map).difference(source_map):
-            fade_target.add(target_map[key])
-
-        if self.transform_mismatches:
-            anims.append(Transform(fade_source.copy(), fade_target, **kwargs))
-        if self.fade_transform_mismatches:
-            anims.append(FadeTransformPieces(fade_source, fade_target, **kwargs))
-        else:
-            anims.append(
-                FadeOut(fade_source, self.fade_direction, **kwargs, run_time=0.5)
-            )
-            anims.append(FadeIn(fade_target.copy(), self.fade_direction, **kwargs))
-
-        super().__init__(*anims)
-
-        self.to_remove = mobject
-        self.to_add = target_mobject
-
-    def get_shape_map(self, mobject):
-        shape_map = {}
-        for sm in self.get_mobject_parts(mobject):
-            key = self.get_mobject_key(sm)
-            if key not in shape_map:
-                shape_map[key] = VGroup()
-            shape_map[key].add(sm)
-        return shape_map
-
-    def clean_up_from_scene(self, scene):
-        for anim in self.animations:
-            anim.update(0)
-        scene.remove(self.mobject)
-        scene.remove(self.to_remove)
-        scene.add(self.to_add)
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        # To be implemented in subclass
-        return mobject
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        # To be implemented in subclass
-        return hash(mobject)
-
-
-class TransformMatchingTexJ(TransformMatchingPartsJ):
-    CONFIG = {
-        "mobject_type": VMobject,
-        "group_type": VGroup,
-    }
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        return mobject.submobjects
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        return mobject.get_tex()
-
-
-class TransformMatchingShapesJ(TransformMatchingPartsJ):
-    CONFIG = {
-        "mobject_type": VMobject,
-        "group_type": VGroup,
-    }
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        return mobject.family_members_with_points()
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        mobject.save_state()
-        mobject.center()
-        mobject.set_height(1)
-        result = hash(np.round(mobject.get_points(), 3).tobytes())
-        mobject.restore()
-        return result
-
-
 class DepressedCubic(ThreeDScene):
     def construct(self):
         frame = self.camera.frame
@@ -174,17 +82,17 @@ class DepressedCubic(ThreeDScene):
         y = 7
         z = 2
 
-        x_cube = Cube(side_length=x).set_color(PURPLE).shift(UL * 8)  # full cube
+        x_cube = CachedCube(side_length=x).set_color(PURPLE).shift(UL * 8)  # full cube
 
         y_cube = (
-            Cube(side_length=y)
+            CachedCube(side_length=y)
             .set_color(YELLOW_D)
             .next_to(x_cube, ORIGIN, aligned_edge=UP + RIGHT + IN, buff=0)
             # .shift(LEFT * y / 2)
         ).set_opacity(general_opacity)
 
         z_cube = (
-            Cube(side_length=z)
+            CachedCube(side_length=z)
             .set_color(RED_C)
             .next_to(y_cube, DOWN + LEFT + OUT, buff=0)
         )
@@ -192,20 +100,20 @@ class DepressedCubic(ThreeDScene):
         # x, y, y prisms
         ####################################################
         z_y_y = (
-            Prism(dimensions=[z, y, y])
+            CachedPrism(dimensions=[z, y, y])
             .set_color(BLUE_D)
             .rotate(PI / 2, OUT)
             .next_to(y_cube, DOWN, buff=0)
         ).set_opacity(general_opacity)
 
         z_y_y_1 = (
-            (Prism(dimensions=[z, y, y]).set_color(BLUE_D))
+            (CachedPrism(dimensions=[z, y, y]).set_color(BLUE_D))
             # .rotate(PI / 2, Z_AXIS)
             .next_to(y_cube, LEFT, buff=0)
         ).set_opacity(general_opacity)
 
         z_y_y_2 = (
-            Prism(dimensions=[y, y, z])
+            CachedPrism(dimensions=[y, y, z])
             .set_color(BLUE_D)
             .rotate(0)
             .next_to(y_cube, OUT, buff=0)
@@ -214,21 +122,21 @@ class DepressedCubic(ThreeDScene):
         # x, x, y prisms
         ####################################################
         z_z_y = (
-            Prism(dimensions=[z, z, y])
+            CachedPrism(dimensions=[z, z, y])
             .set_color(GREEN)
             .rotate(PI / 2, X_AXIS)
             .next_to(y_cube, OUT + LEFT, buff=0)
             .set_opacity(general_opacity)
         )
         z_z_y_1 = (
-            Prism(dimensions=[z, z, y])
+            CachedPrism(dimensions=[z, z, y])
             .set_color(GREEN)
             .rotate(PI / 2, Y_AXIS)
             .next_to(y_cube, DOWN + OUT, buff=0)
         ).set_opacity(general_opacity)
 
         z_z_y_2 = (
-            Prism(dimensions=[z, z, y])
+            CachedPrism(dimensions=[z, z, y])
             .set_color(GREEN)
             .next_to(y_cube, LEFT + DOWN, buff=0)
         ).set_opacity(general_opacity)
@@ -237,24 +145,26 @@ class DepressedCubic(ThreeDScene):
         # DEPRESSED CUBIC
 
         depressed_prism = (
-            Prism(dimensions=[x, x, b]).set_color(BLUE_D).shift(DR * 8)
+            CachedPrism(dimensions=[x, x, b]).set_color(BLUE_D).shift(DR * 8)
         )  # full depressed prism
 
         dep_y = (
-            Prism(dimensions=[y, y, b])
+            CachedPrism(dimensions=[y, y, b])
             .set_color(YELLOW_D)
             .next_to(depressed_prism, ORIGIN, aligned_edge=RIGHT + IN + UP)
         )  # main one
         dep_z = (
-            Prism(dimensions=[z, z, b])
+            CachedPrism(dimensions=[z, z, b])
             .set_color(RED_C)
             .next_to(dep_y, DOWN + LEFT, buff=0)
         )
         dep_byz = (
-            Prism(dimensions=[y, z, b]).set_color(GREEN).next_to(dep_y, DOWN, buff=0)
+            CachedPrism(dimensions=[y, z, b])
+            .set_color(GREEN)
+            .next_to(dep_y, DOWN, buff=0)
         )
         dep_byz_1 = (
-            Prism(dimensions=[y, z, b])
+            CachedPrism(dimensions=[y, z, b])
             .set_color(GREEN)
             .rotate(PI / 2, Z_AXIS)
             .next_to(dep_y, LEFT, buff=0)
@@ -366,18 +276,20 @@ class _26_DepressedEquations(Scene):
         self.wait(2)
 
 
-class _26_DepressedEquationsBreakdown(Scene):
+class _26_DepressedEquationsBreakdown(LazyTexScene):
     def construct(self):
 
         original_eq = (
-            Tex(f"ax^3 +bx^2 + cx + d", "= 0", isolate=["x", "a", "b", "c", "d", "+"])
+            LazyTex(
+                f"ax^3 +bx^2 + cx + d", "= 0", isolate=["x", "a", "b", "c", "d", "+"]
+            )
             .set_color(BLACK)
             .scale(1.2)
         )
 
         sustitute = R"x - \frac{b}{3a}"
         eq_sus = (
-            Tex(
+            LazyTex(
                 f"a",
                 f"\left({sustitute}\\right)^3",
                 f"+",
@@ -396,7 +308,7 @@ class _26_DepressedEquationsBreakdown(Scene):
         )
 
         expand_1 = (
-            Tex(
+            LazyTex(
                 R"ax^3",
                 R"-\frac{2bx^2}{3}",  # to indicate 1
                 R"+\frac{b^2x}{9}",
@@ -413,7 +325,7 @@ class _26_DepressedEquationsBreakdown(Scene):
             .scale(0.9)
         )
 
-        compress_1 = Tex(
+        compress_1 = LazyTex(
             R"ax^3",
             R"-bx^2",
             R"+\frac{7b^2x}{9}",
@@ -426,7 +338,7 @@ class _26_DepressedEquationsBreakdown(Scene):
         ).set_color(BLACK)
 
         final_eq = (
-            Tex(
+            LazyTex(
                 R"ax^3",
                 R"+\left(c - \frac{b^2}{3a}\right)x",
                 "+",
@@ -444,7 +356,9 @@ class _26_DepressedEquationsBreakdown(Scene):
         self.wait(3)
 
         self.play(
-            TransformMatchingTexJ(original_eq, eq_sus, fade_direction=ORIGIN),
+            TransformMatchingTexJ(
+                original_eq, eq_sus, fade_direction=ORIGIN, fade_out_run_time=0.5
+            ),
             run_time=3,
         )
 
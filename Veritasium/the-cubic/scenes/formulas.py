@@ -1,3 +1,5 @@
+import os
+import sys
 from inspect import trace
 from operator import ge, ne
 from typing import Optional
@@ -5,196 +7,11 @@ from typing_extensions import runtime
 from manimlib import *
 import numpy as np
 from numpy import sqrt
-import colorsys
-from itertools import product
 
-
-def xor(tup_a, tup_b):
-    return tuple(a ^ b for a, b in zip(tup_a, tup_b))
-
-
-def scale_lightness(rgb, scale_l):
-
-    if isinstance(rgb, str):
-        rgb = hex_to_rgb(rgb)
-    # convert rgb to hls
-    h, l, s = colorsys.rgb_to_hls(*rgb)
-    # manipulate h, l, s values and return as rgb
-    return rgb_to_hex(colorsys.hls_to_rgb(h, min(1, l * scale_l), s=s))
-
-
-class JPrism(Group):
-    def __init__(self, dimensions=[1, 2, 3], fill_color=BLUE, stroke_color=BLACK):
-        self.prism = Prism(dimensions=dimensions).set_color(fill_color)
-
-        vertices = list(product([0, 1], repeat=3))
-
-        edges = []
-
-        for v1 in vertices:
-            for v2 in vertices:
-                if v1 != v2 and sum(xor(v1, v2)) < 2:
-
-                    l = (
-                        Line3D(
-                            start=self.prism.get_corner(np.array(v1)),
-                            end=self.prism.get_corner(np.array(v2)),
-                            width=0.002,
-                            gloss=-1,
-                        )
-                        .set_color(
-                            scale_lightness(fill_color, 0.3)
-                            if stroke_color is None
-                            else stroke_color
-                        )
-                        .set_gloss(-1, recurse=True)
-                    )
-
-                    edges.append(l)
-
-        self.edges = Group(*edges)
-        for dim, value in enumerate(self.prism.dimensions):
-            self.edges.rescale_to_fit(value + 0.0050, dim, stretch=True)
-
-        self.edges.move_to(self.prism.get_center())
-
-        super().__init__(self.prism, *self.edges)
-
-
-class JCube(JPrism):
-    def __init__(self, side_length=2, fill_color=BLUE, stroke_color=BLACK):
-        super().__init__(
-            dimensions=[side_length, side_length, side_length],
-            fill_color=fill_color,
-            stroke_color=stroke_color,
-        )
-
-
-class TransformMatchingPartsJ(AnimationGroup):
-    CONFIG = {
-        "mobject_type": Mobject,
-        "group_type": Group,
-        "transform_mismatches": False,
-        "fade_transform_mismatches": False,
-        "fade_direction": ORIGIN,
-        "key_map": dict(),
-    }
-
-    def __init__(self, mobject, target_mobject, **kwargs):
-        digest_config(self, kwargs)
-        assert isinstance(mobject, self.mobject_type)
-        assert isinstance(target_mobject, self.mobject_type)
-        source_map = self.get_shape_map(mobject)
-        target_map = self.get_shape_map(target_mobject)
-
-        # Create two mobjects whose submobjects all match each other
-        # according to whatever keys are used for source_map and
-        # target_map
-        transform_source = self.group_type()
-        transform_target = self.group_type()
-        kwargs["final_alpha_value"] = 0
-        for key in set(source_map).intersection(target_map):
-            transform_source.add(source_map[key])
-            transform_target.add(target_map[key])
-        anims = [Transform(transform_source, transform_target, **kwargs)]
-        # User can manually specify when one part should transform
-        # into another despite not matching by using key_map
-        key_mapped_source = self.group_type()
-        key_mapped_target = self.group_type()
-        for key1, key2 in self.key_map.items():
-            if key1 in source_map and key2 in target_map:
-                key_mapped_source.add(source_map[key1])
-                key_mapped_target.add(target_map[key2])
-                source_map.pop(key1, None)
-                target_map.pop(key2, None)
-        if len(key_mapped_source) > 0:
-            anims.append(
-                FadeTransform(
-                    key_mapped_source,
-                    key_mapped_target,
-                )
-            )
-
-        fade_source = self.group_type()
-        fade_target = self.group_type()
-        for key in set(source_map).difference(target_map):
-            fade_source.add(source_map[key])
-        for key in set(target_map).difference(source_map):
-            fade_target.add(target_map[key])
-
-        if self.transform_mismatches:
-            anims.append(Transform(fade_source.copy(), fade_target, **kwargs))
-        if self.fade_transform_mismatches:
-            anims.append(FadeTransformPieces(fade_source, fade_target, **kwargs))
-        else:
-            anims.append(FadeOut(fade_source, self.fade_direction, **kwargs))
-            anims.append(FadeIn(fade_target.copy(), self.fade_direction, **kwargs))
-
-        super().__init__(*anims)
-
-        self.to_remove = mobject
-        self.to_add = target_mobject
-
-    def get_shape_map(self, mobject):
-        shape_map = {}
-        for sm in self.get_mobject_parts(mobject):
-            key = self.get_mobject_key(sm)
-            if key not in shape_map:
-                shape_map[key] = VGroup()
-            shape_map[key].add(sm)
-        return shape_map
-
-    def clean_up_from_scene(self, scene):
-        for anim in self.animations:
-            anim.update(0)
-        scene.remove(self.mobject)
-        scene.remove(self.to_remove)
-        scene.add(self.to_add)
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        # To be implemented in subclass
-        return mobject
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        # To be implemented in subclass
-        return hash(mobject)
-
-
-class TransformMatchingTexJ(TransformMatchingPartsJ):
-    CONFIG = {
-        "mobject_type": VMobject,
-        "group_type": VGroup,
-    }
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        return mobject.submobjects
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        return mobject.get_tex()
-
-
-class TransformMatchingShapesJ(TransformMatchingPartsJ):
-    CONFIG = {
-        "mobject_type": VMobject,
-        "group_type": VGroup,
-    }
-
-    @staticmethod
-    def get_mobject_parts(mobject):
-        return mobject.family_members_with_points()
-
-    @staticmethod
-    def get_mobject_key(mobject):
-        mobject.save_state()
-        mobject.center()
-        mobject.set_height(1)
-        result = hash(np.round(mobject.get_points(), 3).tobytes())
-        mobject.restore()
-        return result
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from prisms import JCube, JPrism, LODScene
+from tex_cache import Tex, Text
+from transform_matching import TransformMatchingChainJ, TransformMatchingTexJ
 
 
 class _17_IntroToCubic(Scene):
@@ -234,7 +51,7 @@ class _17_IntroToCubic(Scene):
         self.wait(2)
 
 
-class _19_NumbersAndBlocks(Scene):
+class _19_NumbersAndBlocks(LODScene):
     def construct(self):
 
         x = 2
@@ -563,6 +380,22 @@ class _NO__(Scene):
 
         find_x_3 = Tex("x", "=", "2").set_color(BLACK).scale(3)
 
+        extract_z = TransformMatchingChainJ(three_yz, extract_z_2, extract_z_3)
+        plug_z = TransformMatchingChainJ(
+            z_3_minus_y_3,
+            plug_z_1,
+            plug_z_2,
+            plug_z_3,
+            plug_z_4,
+            plug_z_5,
+            key_maps={3: {"-": "+"}},
+        )
+        find_y = TransformMatchingChainJ(
+            find_y_1, find_y_2, find_y_3, find_y_4, find_y_5
+        )
+        find_z = TransformMatchingChainJ(z_3_minus_y_3, find_z_2, find_z_3, find_z_4)
+        find_x = TransformMatchingChainJ(find_x_1, find_x_2, find_x_3)
+
         time = 3
 
         self.play(Write(three_yz.shift(UP * 2)))
@@ -571,9 +404,9 @@ class _NO__(Scene):
         self.wait(time)
         self.play(FadeOut(z_3_minus_y_3), three_yz.animate.shift(DOWN * 2))
         self.wait(time)
-        self.play(TransformMatchingTexJ(three_yz, extract_z_2), run_time=2)
+        self.play(extract_z[0], run_time=2)
         self.wait(time)
-        self.play(TransformMatchingTexJ(extract_z_2, extract_z_3), run_time=2)
+        self.play(extract_z[1], run_time=2)
         self.wait(time)
 
         extract_z_3_corner = extract_z_3.copy().scale(0.2).to_corner(UL)
@@ -583,30 +416,28 @@ class _NO__(Scene):
 
         self.play(Write(z_3_minus_y_3), run_time=2)
         self.wait(time)
-        self.play(TransformMatchingTexJ(z_3_minus_y_3, plug_z_1), run_time=2)
+        self.play(plug_z[0], run_time=2)
         self.wait(time)
-        self.play(TransformMatchingTexJ(plug_z_1, plug_z_2), run_time=2)
+        self.play(plug_z[1], run_time=2)
         self.wait(time)
-        self.play(TransformMatchingTexJ(plug_z_2, plug_z_3), run_time=2)
+        self.play(plug_z[2], run_time=2)
         self.wait(time)
-        self.play(
-            TransformMatchingTexJ(plug_z_3, plug_z_4, key_map={"-": "+"}), run_time=2
-        )
+        self.play(plug_z[3], run_time=2)
         self.wait(time * 2)
-        self.play(TransformMatchingTexJ(plug_z_4, plug_z_5), run_time=2)
+        self.play(plug_z[4], run_time=2)
         self.wait(time)
         self.play(FadeOut(extract_z_3), FadeOut(plug_z_5))
         self.wait(time)
 
         self.play(Write(find_y_1))
         self.wait(time)
-        self.play(TransformMatchingTexJ(find_y_1, find_y_2))
+        self.play(find_y[0])
         self.wait(time)
-        self.play(TransformMatchingTexJ(find_y_2, find_y_3))
+        self.play(find_y[1])
         self.wait(time)
-        self.play(TransformMatchingTexJ(find_y_3, find_y_4))
+        self.play(find_y[2])
         self.wait(time)
-        self.play(TransformMatchingTexJ(find_y_4, find_y_5))
+        self.play(find_y[3])
         self.wait(time)
 
         find_y_5_corner = find_y_5.copy().scale(0.3).to_corner(UL)
@@ -614,11 +445,11 @@ class _NO__(Scene):
         self.wait(time)
         self.play(Write(z_3_minus_y_3))
         self.wait(time)
-        self.play(TransformMatchingTexJ(z_3_minus_y_3, find_z_2))
+        self.play(find_z[0])
         self.wait(time)
-        self.play(FadeOut(find_y_5), TransformMatchingTexJ(find_z_2, find_z_3))
+        self.play(FadeOut(find_y_5), find_z[1])
         self.wait(time)
-        self.play(TransformMatchingTexJ(find_z_3, find_z_4))
+        self.play(find_z[2])
         self.wait(time)
 
         find_z_4_corner = find_z_4.copy().scale(0.3).to_corner(UL)
@@ -626,9 +457,9 @@ class _NO__(Scene):
         self.wait(time)
         self.play(Write(find_x_1))
         self.wait(time)
-        self.play(TransformMatchingTexJ(find_x_1, find_x_2))
+        self.play(find_x[0])
         self.wait(time)
-        self.play(TransformMatchingTexJ(find_x_2, find_x_3))
+        self.play(find_x[1])
         self.wait(time)
 
         self.wait(10)
@@ -1,7 +1,12 @@
+import os
+import sys
 from math import sqrt
 from manimlib import *
 from numpy import right_shift
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tex_cache import Tex, Text
+
 
 class DashedRectangle(VGroup):
     CONFIG = {"num_dashes": 30, "positive_space_ratio": 0.5, "width": 5, "height": 4}
@@ -0,0 +1,277 @@
+import colorsys
+from collections import OrderedDict
+from itertools import product
+from manimlib import *
+
+# JPrism and the lines and boxes it is made of, with the LODScene that keeps
+# its lines at the resolution they need, shared by the scenes that stack
+# cubes. Each scene file imports what it uses:
+#
+#   sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+#   from prisms import JCube, JPrism, LODScene
+
+
+def xor(tup_a, tup_b):
+    return tuple(a ^ b for a, b in zip(tup_a, tup_b))
+
+
+def scale_lightness(rgb, scale_l):
+
+    if isinstance(rgb, str):
+        rgb = hex_to_rgb(rgb)
+    # convert rgb to hls
+    h, l, s = colorsys.rgb_to_hls(*rgb)
+    # manipulate h, l, s values and return as rgb
+    return rgb_to_hex(colorsys.hls_to_rgb(h, min(1, l * scale_l), s=s))
+
+
+class JLine3D(Line3D):
+    # A Line3D with as many sides as its width on screen needs. Along its
+    # length it's straight, so two rings of points are enough. A LODScene
+    # picks the sides, and the line only gets rebuilt when they change
+    CONFIG = {
+        "width": 0.05,
+        "resolution": (21, 2),
+        # Sides to choose from, the fewest that keep each one this short
+        "lod_sides": [4, 6, 10, 20],
+        "pixels_per_side": 3,
+    }
+
+    def get_lod_resolution(self, pixels_per_unit):
+        circumference = PI * self.get_line_width() * pixels_per_unit
+        for sides in self.lod_sides:
+            if circumference / sides <= self.pixels_per_side:
+                break
+        return (sides + 1, 2)
+
+    def get_rings(self):
+        # Points around the start and around the end, without the one
+        # repeated to close each ring
+        nu, nv = self.resolution
+        s_points = self.get_surface_points_and_nudged_points()[0]
+        s_points = s_points.reshape((nu, nv, 3))
+        return s_points[:-1, 0], s_points[:-1, -1]
+
+    def get_line_width(self):
+        start_ring = self.get_rings()[0]
+        return 2 * get_norm(start_ring[0] - start_ring.mean(0))
+
+    def set_resolution(self, resolution):
+        if tuple(resolution) == tuple(self.resolution):
+            return self
+        start, end = (ring.mean(0) for ring in self.get_rings())
+        self.radius = self.get_line_width() / 2
+        self.height = get_norm(end - start)
+        self.axis = end - start
+        self.resolution = tuple(resolution)
+        self.init_points()
+        self.shift((start + end) / 2)
+        self.compute_triangle_indices()
+        return self
+
+
+class LODScene(Scene):
+    # Keeps every JLine3D it draws at the resolution its width in pixels
+    # needs, at the zoom of the frame, the depth of the line and the
+    # resolution being rendered. Lines being animated keep theirs until the
+    # animation is over. Mix ThreeDScene in for its camera
+    def lock_static_mobject_data(self, *animations):
+        self.locked_animations = animations
+        if not self.skip_animations:
+            self.update_line_resolutions()
+        super().lock_static_mobject_data(*animations)
+
+    def unlock_mobject_data(self):
+        self.locked_animations = None
+        super().unlock_mobject_data()
+
+    def update_frame(self, dt=0, ignore_skipping=False):
+        if not self.skip_animations or ignore_skipping:
+            animations = getattr(self, "locked_animations", None)
+            if self.update_line_resolutions() and animations is not None:
+                # The static mobjects were locked with the old resolutions.
+                # Outside of play and wait, as in embed, nothing is locked
+                self.unlock_mobject_data()
+                self.lock_static_mobject_data(*animations)
+        super().update_frame(dt, ignore_skipping)
+
+    def update_line_resolutions(self):
+        # Returns whether any line got rebuilt
+        movers = set(
+            mob
+            for animation in getattr(self, "locked_animations", None) or []
+            for mob in animation.mobject.get_family()
+        )
+        changed = False
+        for mobject in self.mobjects:
+            for mob in mobject.get_family():
+                if not isinstance(mob, JLine3D) or mob in movers:
+                    continue
+                resolution = mob.get_lod_resolution(self.get_pixels_per_unit(mob))
+                if resolution != tuple(mob.resolution):
+                    mob.set_resolution(resolution)
+                    changed = True
+        return changed
+
+    def get_pixels_per_unit(self, line):
+        # Pixels per unit at whichever end of the line is closer to the
+        # camera, scaled the way the shaders scale for perspective
+        frame = self.camera.frame
+        pixel_height = self.camera.get_pixel_height()
+        if line.is_fixed_in_frame:
+            return pixel_height / FRAME_HEIGHT
+        rotation = frame.get_inverse_camera_rotation_matrix()
+        focal_distance = frame.get_focal_distance()
+        scale = 0
+        for ring in line.get_rings():
+            z = np.dot(rotation, ring.mean(0) - frame.get_center())[2]
+            if z < focal_distance:
+                scale = max(scale, focal_distance / (focal_distance - z))
+        return scale * pixel_height / frame.get_height()
+
+
+# Surface points, du points and dv points of the six faces of a cube of
+# side 1, built once and shared by every JBox
+UNIT_BOX_POINTS = {}
+
+# Points of a JBox by its dimensions, each new box copies them, least
+# recently used first
+BOX_POINTS = OrderedDict()
+BOX_POINTS_SIZE = 64
+
+
+def get_unit_box_points():
+    if not UNIT_BOX_POINTS:
+        faces = Cube(side_length=1).submobjects
+        for key, points in zip(
+            ["s_points", "du_points", "dv_points"],
+            zip(*(face.get_surface_points_and_nudged_points() for face in faces)),
+        ):
+            UNIT_BOX_POINTS[key] = np.vstack(points)
+    return UNIT_BOX_POINTS
+
+
+def get_box_points(dimensions):
+    key = tuple(dimensions)
+    if key in BOX_POINTS:
+        BOX_POINTS.move_to_end(key)
+        return BOX_POINTS[key]
+    unit_box = get_unit_box_points()
+    dimensions = np.array(dimensions, dtype=float)
+    BOX_POINTS[key] = np.vstack(
+        [unit_box[name] * dimensions for name in ["s_points", "du_points", "dv_points"]]
+    )
+    if len(BOX_POINTS) > BOX_POINTS_SIZE:
+        BOX_POINTS.popitem(last=False)
+    return BOX_POINTS[key]
+
+
+class JBox(Surface):
+    # Looks like Prism(dimensions), but the six faces are one surface, the
+    # unit cube stretched to the dimensions, rather than an SGroup of six
+    # Square3D. Every JBox then renders with the same shader as a single
+    # mobject, so the camera batches all of them together
+    CONFIG = {
+        "dimensions": [3, 2, 1],
+        "color": BLUE,
+        "opacity": 1,
+        "gloss": 0.5,
+        # Faces are stacked along u, two rows of two points each
+        "resolution": (12, 2),
+    }
+
+    def init_points(self):
+        # set_points copies them into this box's own array
+        self.set_points(get_box_points(self.dimensions))
+
+    def compute_triangle_indices(self):
+        # Two triangles per face, none across faces
+        face_indices = np.array([0, 2, 1, 1, 2, 3])
+        self.triangle_indices = np.hstack([face_indices + 4 * i for i in range(6)])
+
+
+class JPrismEdges(VMobject):
+    # The 12 edges of a box as the subpaths of a single stroke, each drawn
+    # once, so a whole wireframe is one draw. Stroke widths are in hundredths
+    # of a unit, 0.2 is as thick as the 0.002 wide Line3D edges. Unlike the
+    # cylinders, a stroke has no shading, which is why JPrism only draws
+    # its edges this way with merge_edges=True
+    CONFIG = {
+        "stroke_width": 0.2,
+    }
+
+    def __init__(self, box, **kwargs):
+        super().__init__(**kwargs)
+        vertices = list(product([0, 1], repeat=3))
+        for v1 in vertices:
+            for v2 in vertices:
+                if v1 < v2 and sum(xor(v1, v2)) == 1:
+                    self.start_new_path(box.get_corner(2 * np.array(v1) - 1))
+                    self.add_line_to(box.get_corner(2 * np.array(v2) - 1))
+        # A flat stroke lies in the plane of its path, so edges seen side on
+        # would vanish
+        self.set_flat_stroke(False)
+        self.apply_depth_test()
+
+    def set_opacity(self, opacity, recurse=True):
+        # A wireframe has nothing to fill
+        return self.set_stroke(opacity=opacity, recurse=recurse)
+
+
+class JPrism(Group):
+    def __init__(
+        self,
+        dimensions=[1, 2, 3],
+        fill_color=BLUE,
+        stroke_color=BLACK,
+        merge_edges=False,
+    ):
+        self.prism = JBox(dimensions=dimensions).set_color(fill_color)
+        edge_color = (
+            scale_lightness(fill_color, 0.3) if stroke_color is None else stroke_color
+        )
+
+        if merge_edges:
+            edges = [JPrismEdges(self.prism).set_stroke(edge_color)]
+        else:
+            vertices = list(product([0, 1], repeat=3))
+
+            edges = []
+
+            for v1 in vertices:
+                for v2 in vertices:
+                    # Each edge once, (v2, v1) is the same line
+                    if v1 < v2 and sum(xor(v1, v2)) == 1:
+
+                        l = (
+                            JLine3D(
+                                start=self.prism.get_corner(2 * np.array(v1) - 1),
+                                end=self.prism.get_corner(2 * np.array(v2) - 1),
+                                width=0.002,
+                                gloss=-1,
+                            )
+                            .set_color(edge_color)
+                            .set_gloss(-1, recurse=True)
+                        )
+
+                        edges.append(l)
+
+        self.edges = Group(*edges)
+        for dim, value in enumerate(self.prism.dimensions):
+            self.edges.rescale_to_fit(value + 0.0050, dim, stretch=True)
+
+        self.edges.move_to(self.prism.get_center())
+
+        super().__init__(self.prism, *self.edges)
+
+
+class JCube(JPrism):
+    def __init__(
+        self, side_length=2, fill_color=BLUE, stroke_color=BLACK, merge_edges=False
+    ):
+        super().__init__(
+            dimensions=[side_length, side_length, side_length],
+            fill_color=fill_color,
+            stroke_color=stroke_color,
+            merge_edges=merge_edges,
+        )
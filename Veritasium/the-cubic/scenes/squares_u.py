@@ -1,6 +1,11 @@
+import os
+import sys
 from manimlib import *
 from numpy import int32, sqrt
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tex_cache import Tex
+
 
 class Rectangle(Rectangle):
     def get_center_of_edges(self, buff=SMALL_BUFF * 3):
@@ -0,0 +1,551 @@
+import atexit
+import json
+import os
+import pickle
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from manimlib import *
+from manimlib.utils.tex_file_writing import display_during_execution
+from manimlib.utils.tex_file_writing import tex_hash
+from manimlib.utils.tex_file_writing import tex_to_svg_file
+
+# Tex and Text that go through caches shared by all the scenes, imported by
+# each scene file in place of the manimlib ones:
+#
+#   sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+#   from tex_cache import Tex
+
+
+# Parsed Tex by content (the tex string, its options and the LaTeX
+# template), least recently used first
+TEX_CACHE = OrderedDict()
+TEX_CACHE_SIZE = 512
+TEX_CACHE_STATS = {"hits": 0, "misses": 0, "pool_hits": 0}
+
+# Whole Tex by their arguments, so building the same label again is a copy
+# of the first one, least recently used first
+TEX_POOL = OrderedDict()
+TEX_POOL_SIZE = 256
+
+# Compiled isolate patterns by the substrings they split on
+ISOLATE_PATTERNS = {}
+
+
+def init_cached_tex_mobject(tex_mob):
+    # Replaces SVGMobject.init_svg_mobject, whose cache is neither bounded
+    # nor aware of the template
+    tex_config = get_tex_config()
+    key = hash_obj((tex_mob.hash_seed, tex_config["tex_body"]))
+    if key in TEX_CACHE:
+        TEX_CACHE.move_to_end(key)
+        TEX_CACHE_STATS["hits"] += 1
+        tex_mob.add(*TEX_CACHE[key].copy())
+        return
+    TEX_CACHE_STATS["misses"] += 1
+    tex_mob.generate_mobject()
+    TEX_CACHE[key] = tex_mob.copy()
+    if len(TEX_CACHE) > TEX_CACHE_SIZE:
+        TEX_CACHE.popitem(last=False)
+
+
+@atexit.register
+def log_tex_cache_stats():
+    if TEX_CACHE_STATS["hits"] + TEX_CACHE_STATS["misses"] > 0:
+        log.info(
+            f"Tex cache: {TEX_CACHE_STATS['hits']} hits, "
+            f"{TEX_CACHE_STATS['misses']} misses, "
+            f"{TEX_CACHE_STATS['pool_hits']} pooled"
+        )
+
+
+class SingleStringTex(SingleStringTex):
+    def init_svg_mobject(self):
+        init_cached_tex_mobject(self)
+
+    def get_file_path(self):
+        return get_tex_svg_file(self)
+
+
+class Tex(Tex):
+    def __init__(self, *tex_strings, **kwargs):
+        try:
+            key = hash_obj((tex_strings, kwargs, get_tex_config()["tex_body"]))
+        except TypeError:
+            # Unhashable arguments, like numpy arrays, don't get pooled
+            super().__init__(*tex_strings, **kwargs)
+            return
+        if key in TEX_POOL:
+            TEX_POOL.move_to_end(key)
+            TEX_CACHE_STATS["pool_hits"] += 1
+            self.become_copy_of(TEX_POOL[key])
+            return
+        super().__init__(*tex_strings, **kwargs)
+        TEX_POOL[key] = self.copy()
+        if len(TEX_POOL) > TEX_POOL_SIZE:
+            TEX_POOL.popitem(last=False)
+
+    def become_copy_of(self, tex_mob):
+        # Sets self up the way Mobject.copy sets up a copy of tex_mob, which
+        # skips break_up_by_substrings, the coloring and the rest of __init__
+        # altogether
+        own_attrs = ["parents", "family", "submobjects", "data", "uniforms"]
+        for attr, value in tex_mob.__dict__.items():
+            if attr in [*own_attrs, "tex_part_index"]:
+                continue
+            if isinstance(value, (np.ndarray, ShaderWrapper)):
+                value = value.copy()
+            setattr(self, attr, value)
+        self.parents = []
+        self.submobjects = []
+        self.data = {key: value.copy() for key, value in tex_mob.data.items()}
+        self.uniforms = {
+            key: value.copy() if isinstance(value, np.ndarray) else value
+            for key, value in tex_mob.uniforms.items()
+        }
+        self.set_submobjects([submob.copy() for submob in tex_mob.submobjects])
+        self.match_updaters(tex_mob)
+
+    def init_svg_mobject(self):
+        init_cached_tex_mobject(self)
+
+    def get_file_path(self):
+        return get_tex_svg_file(self)
+
+    def break_up_by_substrings(self):
+        # Same as Tex.break_up_by_substrings, but the substrings are built
+        # with the SingleStringTex above so they go through the cache too
+        if len(self.tex_strings) == 1:
+            submob = self.copy()
+            self.set_submobjects([submob])
+            return self
+        new_submobjects = []
+        curr_index = 0
+        config = dict(self.CONFIG)
+        config["alignment"] = ""
+        for tex_string in self.tex_strings:
+            tex_string = tex_string.strip()
+            if len(tex_string) == 0:
+                continue
+            sub_tex_mob = SingleStringTex(tex_string, **config)
+            num_submobs = len(sub_tex_mob)
+            if num_submobs == 0:
+                continue
+            new_index = curr_index + num_submobs
+            sub_tex_mob.set_submobjects(self[curr_index:new_index])
+            new_submobjects.append(sub_tex_mob)
+            curr_index = new_index
+        self.set_submobjects(new_submobjects)
+        return self
+
+    def break_up_tex_strings(self, tex_strings):
+        # Same as Tex.break_up_tex_strings, with the pattern compiled once
+        substrings_to_isolate = (*self.isolate, *self.tex_to_color_map.keys())
+        if len(substrings_to_isolate) == 0:
+            return tex_strings
+        if substrings_to_isolate not in ISOLATE_PATTERNS:
+            ISOLATE_PATTERNS[substrings_to_isolate] = re.compile(
+                "|".join(f"({re.escape(ss)})" for ss in substrings_to_isolate)
+            )
+        pattern = ISOLATE_PATTERNS[substrings_to_isolate]
+        pieces = []
+        for tex_string in tex_strings:
+            pieces.extend(pattern.split(tex_string))
+        return list(filter(lambda s: s, pieces))
+
+    def get_parts_by_tex(self, tex, substring=True, case_sensitive=True):
+        # Same parts as Tex.get_parts_by_tex, but each query is answered once
+        # and kept until the parts change
+        index = self.get_tex_part_index()
+        query = (tex, substring, case_sensitive)
+        if query not in index["queries"]:
+            index["queries"][query] = [
+                i
+                for i, part_tex in enumerate(index["texs"])
+                if part_tex is not None
+                and self.tex_matches(tex, part_tex, substring, case_sensitive)
+            ]
+        return VGroup(*(self.submobjects[i] for i in index["queries"][query]))
+
+    @staticmethod
+    def tex_matches(tex, part_tex, substring, case_sensitive):
+        if not case_sensitive:
+            tex = tex.lower()
+            part_tex = part_tex.lower()
+        if substring:
+            return tex in part_tex
+        return tex == part_tex
+
+    def get_tex_part_index(self):
+        # Any add or remove in the family builds a new family list, so that
+        # tells when the index is out of date. The one part of a single
+        # string Tex is a copy of the Tex itself, so parts go by get_tex
+        # rather than by class
+        index = self.__dict__.get("tex_part_index")
+        if index is None or index["family"] is not self.family:
+            index = {
+                "family": self.family,
+                "texs": [
+                    part.get_tex() if hasattr(part, "get_tex") else None
+                    for part in self.submobjects
+                ],
+                "queries": {},
+            }
+            self.tex_part_index = index
+        return index
+
+
+# Text glyph outlines by font, style, size and character, and where each
+# Text puts them, kept between runs in the temporary storage
+TEXT_GLYPHS_FILE = "text_glyphs.pkl"
+TEXT_GLYPHS = {"outlines": {}, "layouts": {}}
+TEXT_GLYPHS_STATE = {"loaded": False, "changed": False}
+
+
+def get_text_glyphs():
+    if not TEXT_GLYPHS_STATE["loaded"]:
+        TEXT_GLYPHS_STATE["loaded"] = True
+        file_name = os.path.join(get_temp_dir(), TEXT_GLYPHS_FILE)
+        if os.path.exists(file_name):
+            with open(file_name, "rb") as file:
+                TEXT_GLYPHS.update(pickle.load(file))
+    return TEXT_GLYPHS
+
+
+@atexit.register
+def save_text_glyphs():
+    if TEXT_GLYPHS_STATE["changed"]:
+        with open(os.path.join(get_temp_dir(), TEXT_GLYPHS_FILE), "wb") as file:
+            pickle.dump(TEXT_GLYPHS, file)
+
+
+class Text(Text):
+    # Puts glyphs together from outlines cached by character once a text with
+    # the same settings has been parsed, instead of parsing pango's svg again.
+    # Texts with t2f, t2s or t2w get parsed every time
+    def init_svg_mobject(self):
+        glyph_keys = self.get_glyph_keys()
+        if glyph_keys is None:
+            super().init_svg_mobject()
+            return
+
+        text_glyphs = get_text_glyphs()
+        layout = text_glyphs["layouts"].get(self.text2hash())
+        if layout is not None:
+            for glyph_key, offset in zip(glyph_keys, layout["offsets"]):
+                glyph = VMobject()
+                glyph.set_points(text_glyphs["outlines"][glyph_key] + offset)
+                glyph.set_style(**layout["style"])
+                self.add(glyph)
+            return
+
+        super().init_svg_mobject()
+        if len(glyph_keys) == 0 or len(self.submobjects) != len(glyph_keys):
+            return
+        offsets = []
+        for glyph_key, glyph in zip(glyph_keys, self.submobjects):
+            offset = glyph.get_points().min(0)
+            text_glyphs["outlines"].setdefault(glyph_key, glyph.get_points() - offset)
+            offsets.append(offset)
+        style = self.submobjects[0].get_style()
+        text_glyphs["layouts"][self.text2hash()] = {
+            "offsets": offsets,
+            "style": {
+                key: style[key]
+                for key in [
+                    "fill_rgba",
+                    "stroke_rgba",
+                    "stroke_width",
+                    "stroke_background",
+                ]
+            },
+        }
+        TEXT_GLYPHS_STATE["changed"] = True
+
+    def get_glyph_keys(self):
+        # One per character pango draws, None when they can't be cached
+        if self.t2f or self.t2s or self.t2w:
+            return None
+        if self.font == "":
+            self.font = get_customization()["style"]["font"]
+        return [
+            (self.font, self.slant, self.weight, self.font_size, char)
+            for char in self.text
+            if char not in [" ", "\t", "\n"]
+        ]
+
+
+# Bounding boxes of Tex by their arguments and template, kept between runs
+# in the temporary storage so LazyTex can lay formulas out before compiling
+TEX_METRICS_FILE = "tex_metrics.json"
+TEX_METRICS = {}
+TEX_METRICS_STATE = {"loaded": False, "changed": False}
+
+
+def get_tex_metrics():
+    if not TEX_METRICS_STATE["loaded"]:
+        TEX_METRICS_STATE["loaded"] = True
+        file_name = os.path.join(get_temp_dir(), TEX_METRICS_FILE)
+        if os.path.exists(file_name):
+            with open(file_name, "r") as file:
+                TEX_METRICS.update(json.load(file))
+    return TEX_METRICS
+
+
+@atexit.register
+def save_tex_metrics():
+    if TEX_METRICS_STATE["changed"]:
+        with open(os.path.join(get_temp_dir(), TEX_METRICS_FILE), "w") as file:
+            json.dump(TEX_METRICS, file)
+
+
+def get_tex_metrics_key(tex_strings, kwargs):
+    # repr rather than hash_obj, the key has to be the same on the next run
+    tex_config = get_tex_config()
+    return tex_hash(repr((tex_strings, sorted(kwargs.items()), tex_config["tex_body"])))
+
+
+def get_tex_file_bodies(tex_strings, kwargs):
+    # The bodies Tex(*tex_strings, **kwargs) would compile: the full string,
+    # then every substring when it gets broken up
+    tex = Tex.__new__(Tex)
+    digest_config(tex, kwargs)
+    tex_strings = tex.break_up_tex_strings(tex_strings)
+    bodies = [tex.get_tex_file_body(tex.arg_separator.join(tex_strings))]
+    if len(tex_strings) > 1:
+        sub_tex = SingleStringTex.__new__(SingleStringTex)
+        digest_config(sub_tex, dict(Tex.CONFIG, alignment=""))
+        bodies += [
+            sub_tex.get_tex_file_body(tex_string.strip())
+            for tex_string in tex_strings
+            if tex_string.strip()
+        ]
+    return bodies
+
+
+# Threads running LaTeX for LazyTex while construct goes on, and the svg
+# file each tex file body will be at. LazyTexScene turns the background off
+# while it skips animations, so skipped sections compile nothing up front
+TEX_COMPILE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+TEX_COMPILE_FUTURES = {}
+TEX_COMPILE_STATE = {"background": True}
+
+
+def compile_tex_in_background(body):
+    if body not in TEX_COMPILE_FUTURES:
+        TEX_COMPILE_FUTURES[body] = TEX_COMPILE_POOL.submit(tex_to_svg_file, body)
+    return TEX_COMPILE_FUTURES[body]
+
+
+def cancel_background_tex():
+    # The pool's threads are joined at exit, so whatever is still queued
+    # would hold the process up. Those already running are left to finish
+    for body, future in list(TEX_COMPILE_FUTURES.items()):
+        if future.cancel():
+            TEX_COMPILE_FUTURES.pop(body)
+
+
+def get_tex_svg_file(tex_mob):
+    # SingleStringTex.get_file_path, except that a body already compiling in
+    # the background is waited for. Compiling it again here could read its
+    # svg while the other thread is still writing it
+    body = tex_mob.get_tex_file_body(tex_mob.tex_string)
+    if body in TEX_COMPILE_FUTURES:
+        return TEX_COMPILE_FUTURES[body].result()
+    with display_during_execution(f'Writing "{tex_mob.tex_string}"'):
+        return tex_to_svg_file(body)
+
+
+class LazyTex(Tex):
+    # Stands in for Tex(*tex_strings, **kwargs) with an invisible diagonal
+    # across the bounding box it had on an earlier run, so arrange, next_to
+    # and the like work without waiting for LaTeX, which runs in the
+    # background meanwhile. The formula is built once its parts are needed,
+    # it gets copied or animated, or a LazyTexScene is about to draw it.
+    # Only moves and uniform scaling of the placeholder carry over to it
+    def __init__(self, *tex_strings, **kwargs):
+        VMobject.__init__(self, **kwargs)
+        self.tex_bodies = get_tex_file_bodies(tex_strings, kwargs)
+        if TEX_COMPILE_STATE["background"]:
+            for body in self.tex_bodies:
+                compile_tex_in_background(body)
+        box = get_tex_metrics().get(get_tex_metrics_key(tex_strings, kwargs))
+        # Without a stored box the placeholder is a unit box around the
+        # origin, where Tex is built, until something needs the real size
+        self.box_pending = box is None
+        if box is None:
+            box = [[-0.5, -0.5, 0], [0.5, 0.5, 0]]
+
+        min_point, max_point = map(np.array, box)
+        self.set_points([min_point, (min_point + max_point) / 2, max_point])
+        self.box_width = max_point[0] - min_point[0]
+        self.placeholder_style = self.get_style()
+        self.lazy_tex_args = (tex_strings, kwargs)
+
+    @property
+    def submobjects(self):
+        self.materialize()
+        return self.__dict__["submobjects"]
+
+    @submobjects.setter
+    def submobjects(self, submobjects):
+        self.__dict__["submobjects"] = submobjects
+
+    def __getattr__(self, name):
+        # Only set once the formula is built, so get_tex and the like build it
+        if name in ["tex_string", "tex_strings"] and not self.is_materialized():
+            self.materialize()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__} has no attribute {name}")
+
+    def is_materialized(self):
+        return self.__dict__.get("lazy_tex_args") is None
+
+    def is_box_pending(self):
+        return self.__dict__.get("box_pending", False) and not self.is_materialized()
+
+    def materialize(self):
+        if self.is_materialized():
+            return self
+        tex_strings, kwargs = self.lazy_tex_args
+        self.lazy_tex_args = None
+
+        # All parts at once, in case they weren't sent to the background
+        futures = [compile_tex_in_background(body) for body in self.tex_bodies]
+        for future in futures:
+            future.result()
+        tex = Tex(*tex_strings, **kwargs)
+        key = get_tex_metrics_key(tex_strings, kwargs)
+        if key not in TEX_METRICS:
+            TEX_METRICS[key] = tex.get_bounding_box()[0::2].tolist()
+            TEX_METRICS_STATE["changed"] = True
+        if self.box_width > 0:
+            tex.scale(self.get_width() / self.box_width)
+        tex.move_to(self)
+        style = self.get_style()
+        if any(
+            not np.array_equal(style[key], self.placeholder_style[key])
+            for key in ["fill_rgba", "stroke_rgba", "stroke_width"]
+        ):
+            tex.match_style(self)
+
+        self.data = dict(tex.data)
+        self.tex_string = tex.tex_string
+        self.tex_strings = tex.tex_strings
+        submobjects = list(tex.submobjects)
+        tex.remove(*submobjects)
+        self.add(*submobjects)
+        self.refresh_bounding_box()
+        return self
+
+    def get_bounding_box(self):
+        # The size of a unit box placeholder means nothing, so reading it
+        # builds the formula, unless it's the placeholder moving itself
+        if self.is_box_pending() and not self.__dict__.get("keeping_box", False):
+            self.materialize()
+        return super().get_bounding_box()
+
+    def apply_points_function(
+        self, func, about_point=None, about_edge=ORIGIN, works_on_bounding_box=False
+    ):
+        if self.is_box_pending() and not self.keeps_box_shape(
+            func, about_point, about_edge
+        ):
+            self.materialize()
+        self.keeping_box = True
+        try:
+            return super().apply_points_function(
+                func, about_point, about_edge, works_on_bounding_box
+            )
+        finally:
+            self.keeping_box = False
+
+    def keeps_box_shape(self, func, about_point, about_edge):
+        # Whether func moves or uniformly scales the placeholder, as far as
+        # its diagonal can tell. Anything relative to an edge needs the size
+        if about_point is None and about_edge is not None:
+            if not np.allclose(about_edge, ORIGIN):
+                return False
+            about_point = self.get_points()[1]
+        points = self.get_points()
+        if about_point is None:
+            new_points = func(points.copy())
+        else:
+            new_points = func(points - about_point) + about_point
+        diagonal = points[2] - points[0]
+        new_diagonal = new_points[2] - new_points[0]
+        ratio = new_diagonal[0] / diagonal[0]
+        return (
+            ratio > 0
+            and np.allclose(new_diagonal, ratio * diagonal)
+            and np.allclose(new_points[1], (new_points[0] + new_points[2]) / 2)
+        )
+
+    def copy(self):
+        # Mobject.copy reads the submobjects half way through
+        self.materialize()
+        return super().copy()
+
+
+class LazyTexScene(Scene):
+    # Builds the LazyTex of the scene as soon as they are animated, and the
+    # rest as they come into frame
+    def setup(self):
+        super().setup()
+        TEX_COMPILE_STATE["background"] = not self.skip_animations
+
+    def update_skipping_status(self):
+        super().update_skipping_status()
+        TEX_COMPILE_STATE["background"] = not self.skip_animations
+
+    def tear_down(self):
+        cancel_background_tex()
+        super().tear_down()
+
+    def lock_static_mobject_data(self, *animations):
+        self.locked_animations = animations
+        if not self.skip_animations:
+            self.materialize_lazy_tex(*self.mobjects)
+        super().lock_static_mobject_data(*animations)
+
+    def unlock_mobject_data(self):
+        self.locked_animations = None
+        super().unlock_mobject_data()
+
+    def begin_animations(self, animations):
+        self.materialize_lazy_tex(
+            *(animation.mobject for animation in animations), in_frame_only=False
+        )
+        super().begin_animations(animations)
+
+    def update_frame(self, dt=0, ignore_skipping=False):
+        if not self.skip_animations or ignore_skipping:
+            animations = getattr(self, "locked_animations", None)
+            if self.materialize_lazy_tex(*self.mobjects) and animations is not None:
+                # The static mobjects were locked with the placeholders.
+                # Outside of play and wait, as in embed, nothing is locked
+                self.unlock_mobject_data()
+                self.lock_static_mobject_data(*animations)
+        super().update_frame(dt, ignore_skipping)
+
+    def materialize_lazy_tex(self, *mobjects, in_frame_only=True):
+        # Returns whether any of them got built
+        lazy_texs = [
+            mob
+            for mobject in mobjects
+            for mob in mobject.get_family()
+            if isinstance(mob, LazyTex) and not mob.is_materialized()
+        ]
+        if in_frame_only:
+            frame = self.camera.frame
+            frame_min = frame.get_corner(DL)
+            frame_max = frame.get_corner(UR)
+            lazy_texs = [
+                mob
+                for mob in lazy_texs
+                if np.all(mob.get_corner(UR)[:2] >= frame_min[:2])
+                and np.all(mob.get_corner(DL)[:2] <= frame_max[:2])
+            ]
+        for mob in lazy_texs:
+            mob.materialize()
+        return len(lazy_texs) > 0
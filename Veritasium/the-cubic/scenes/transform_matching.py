@@ -0,0 +1,693 @@
+import atexit
+import copy
+import os
+import time
+from collections import OrderedDict
+from manimlib import *
+from scipy.optimize import linear_sum_assignment
+
+# TransformMatchingTexJ and the caches behind it, shared by all the scenes.
+# Each scene file imports what it uses:
+#
+#   sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+#   from transform_matching import TransformMatchingTexJ
+
+
+# Aligned points of pairs of VMobjects, keyed by digests of both point
+# arrays taken relative to their first point, least recently used first
+ALIGNED_POINTS_CACHE = OrderedDict()
+ALIGNED_POINTS_CACHE_SIZE = 1024
+
+
+class AlignCachedTransform(Transform):
+    # Transform that looks up the aligned points of each pair of
+    # submobjects in ALIGNED_POINTS_CACHE before subdividing curves, so
+    # repeated transitions between the same shapes skip the resampling
+    def begin(self):
+        self.target_mobject = self.create_target()
+        self.check_target_mobject_validity()
+        self.target_copy = self.target_mobject.copy()
+        self.mobject.align_family(self.target_copy)
+        self.align_data(self.mobject, self.target_copy)
+        Animation.begin(self)
+        self.mobject.lock_matching_data(
+            self.starting_mobject,
+            self.target_copy,
+        )
+
+    @classmethod
+    def align_data(cls, mobject, target):
+        # Same as Mobject.align_data, with cached point alignment
+        mobject.refresh_shader_data()
+        for mob1, mob2 in zip(mobject.get_family(), target.get_family()):
+            cls.align_points(mob1, mob2)
+            for key in mob1.data.keys() & mob2.data.keys():
+                if key == "points":
+                    continue
+                arr1 = mob1.data[key]
+                arr2 = mob2.data[key]
+                if len(arr2) > len(arr1):
+                    mob1.data[key] = resize_preserving_order(arr1, len(arr2))
+                elif len(arr1) > len(arr2):
+                    mob2.data[key] = resize_preserving_order(arr2, len(arr1))
+
+    @staticmethod
+    def align_points(mob1, mob2):
+        points1 = mob1.get_points()
+        points2 = mob2.get_points()
+        # Curve insertion commutes with translations, so pairs are cached
+        # relative to their first points (rounded, with -0.0 made 0.0, so
+        # that rounding errors from moving a shape around don't miss), as
+        # long as both are made of whole curves
+        if (
+            len(points1) == len(points2)
+            or len(points1) == 0
+            or len(points2) == 0
+            or type(mob1).align_points is not VMobject.align_points
+            or not isinstance(mob2, VMobject)
+            or len(points1) % mob1.n_points_per_curve != 0
+            or len(points2) % mob2.n_points_per_curve != 0
+        ):
+            mob1.align_points(mob2)
+            return
+        origin1 = points1[0].copy()
+        origin2 = points2[0].copy()
+        key = (
+            hash((np.round(points1 - origin1, 6) + 0.0).tobytes()),
+            hash((np.round(points2 - origin2, 6) + 0.0).tobytes()),
+        )
+        if key not in ALIGNED_POINTS_CACHE:
+            mob1.align_points(mob2)
+            ALIGNED_POINTS_CACHE[key] = (
+                mob1.get_points() - origin1,
+                mob2.get_points() - origin2,
+            )
+            if len(ALIGNED_POINTS_CACHE) > ALIGNED_POINTS_CACHE_SIZE:
+                ALIGNED_POINTS_CACHE.popitem(last=False)
+            return
+        ALIGNED_POINTS_CACHE.move_to_end(key)
+        aligned1, aligned2 = ALIGNED_POINTS_CACHE[key]
+        mob1.set_points(aligned1 + origin1)
+        mob2.set_points(aligned2 + origin2)
+
+
+# Whether manimgl applies an animation's rate_func to each submobject's
+# alpha after lagging it, as it does from 1.6 on, rather than to the alpha
+# of the whole animation before lagging, as before
+RATE_FUNC_PER_SUBMOBJECT = (
+    Animation(Mobject(), rate_func=lambda t: t**2).get_sub_alpha(0.5, 0, 1) != 0.5
+)
+
+
+class TransformMatchingPartsJ(AnimationGroup):
+    CONFIG = {
+        "mobject_type": Mobject,
+        "group_type": Group,
+        "transform_mismatches": False,
+        "fade_transform_mismatches": False,
+        "fade_direction": ORIGIN,
+        # Run time of the fade out of unmatched parts, the whole transform's
+        # when None
+        "fade_out_run_time": None,
+        # Animations for matched parts (and mismatches, with
+        # transform_mismatches) and for the parts paired by key_map
+        "transform_class": AlignCachedTransform,
+        "key_map_transform_class": FadeTransform,
+        "key_map": dict(),
+        "fuse_interpolation": True,
+        "match_duplicates_by_distance": False,
+        # Set TRANSFORM_MATCHING_STATS=1 to collect them for every transform
+        "collect_stats": bool(os.environ.get("TRANSFORM_MATCHING_STATS")),
+        "lazy_animations": True,
+        # What get_matching returns for these two mobjects, when it has
+        # been worked out ahead of time (see TransformMatchingChainJ)
+        "matching": None,
+    }
+
+    def __init__(self, mobject, target_mobject, **kwargs):
+        digest_config(self, kwargs)
+        assert isinstance(mobject, self.mobject_type)
+        assert isinstance(target_mobject, self.mobject_type)
+        kwargs.pop("matching", None)
+        start_time = time.perf_counter()
+        matching = self.matching or self.get_matching(mobject, target_mobject)
+        shape_map_time = time.perf_counter() - start_time
+
+        kwargs["final_alpha_value"] = 0
+        transform_source = self.get_group(matching["transform_source"])
+        transform_target = self.get_group(matching["transform_target"])
+        key_mapped_source = self.get_group(matching["key_mapped_source"])
+        key_mapped_target = self.get_group(matching["key_mapped_target"])
+        fade_source = self.get_group(matching["fade_source"])
+        fade_target = self.get_group(matching["fade_target"])
+
+        self.transform_source = transform_source
+        self.transform_target = transform_target
+        self.key_mapped_source = key_mapped_source
+        self.key_mapped_target = key_mapped_target
+        self.fade_source = fade_source
+        self.fade_target = fade_target
+        self.anim_kwargs = kwargs
+        self.animations_built = not self.lazy_animations
+        self.skipped = False
+        if self.lazy_animations:
+            # The child animations, and the copies they need, are only built
+            # on the first frame (see interpolate), so plays that get skipped
+            # never pay for them. The group holds the pieces of the source so
+            # that the scene knows they are moving
+            self.lazy_timings = self.get_lazy_timings()
+            max_end_time = max((end for start, end in self.lazy_timings), default=0)
+            if self.run_time is None:
+                self.run_time = max_end_time
+            super().__init__(
+                group=Group(transform_source, key_mapped_source, fade_source)
+            )
+            self.max_end_time = max_end_time
+        else:
+            super().__init__(*self.create_animations())
+
+        self.to_remove = mobject
+        self.to_add = target_mobject
+        if self.collect_stats:
+            self.stats = {
+                "name": self.get_stats_name(mobject, target_mobject),
+                "get_shape_map": shape_map_time,
+                "matched": sum(map(len, transform_source)),
+                "key_mapped": sum(map(len, key_mapped_source)),
+                "faded": sum(map(len, fade_source)) + sum(map(len, fade_target)),
+            }
+
+    def create_animations(self):
+        kwargs = self.anim_kwargs
+        transform_source = self.transform_source
+        transform_target = self.transform_target
+        key_mapped_source = self.key_mapped_source
+        key_mapped_target = self.key_mapped_target
+        fade_source = self.fade_source
+        fade_target = self.fade_target
+
+        anims = [self.transform_class(transform_source, transform_target, **kwargs)]
+        if len(key_mapped_source) > 0:
+            anims.append(
+                self.key_map_transform_class(
+                    key_mapped_source,
+                    key_mapped_target,
+                )
+            )
+
+        if self.transform_mismatches:
+            anims.append(
+                self.transform_class(fade_source.copy(), fade_target, **kwargs)
+            )
+        if self.fade_transform_mismatches:
+            anims.append(FadeTransformPieces(fade_source, fade_target, **kwargs))
+        else:
+            fade_out_kwargs = dict(kwargs)
+            if self.fade_out_run_time is not None:
+                fade_out_kwargs["run_time"] = self.fade_out_run_time
+            anims.append(FadeOut(fade_source, self.fade_direction, **fade_out_kwargs))
+            anims.append(FadeIn(fade_target.copy(), self.fade_direction, **kwargs))
+
+        return anims
+
+    def begin(self):
+        self.fused_anims = []
+        if self.animations_built:
+            self.begin_animations()
+
+    def get_lazy_timings(self):
+        # When each child animation starts and ends, without building them.
+        # The same animations over empty groups take just as long, and cost
+        # next to nothing to make
+        dry_run = copy.copy(self)
+        for name in [
+            "transform_source",
+            "transform_target",
+            "key_mapped_source",
+            "key_mapped_target",
+            "fade_source",
+            "fade_target",
+        ]:
+            group = getattr(self, name)
+            setattr(dry_run, name, self.group_type(*(VGroup() for sm in group)))
+        dry_run.animations = dry_run.create_animations()
+        dry_run.build_animations_with_timings()
+        return [(start, end) for anim, start, end in dry_run.anims_with_timings]
+
+    def build_animations(self):
+        self.animations = self.create_animations()
+        self.anims_with_timings = [
+            (anim, start, end)
+            for anim, (start, end) in zip(self.animations, self.lazy_timings)
+        ]
+        self.group.set_submobjects(
+            remove_list_redundancies([anim.mobject for anim in self.animations])
+        )
+        self.animations_built = True
+
+    def begin_animations(self):
+        super().begin()
+        if self.collect_stats:
+            self.stats["points_per_frame"] = sum(
+                sm.get_num_points()
+                for anim in self.animations
+                for sm in anim.mobject.get_family()
+            )
+        if self.fuse_interpolation:
+            self.init_fused_data()
+
+    def init_fused_data(self):
+        # Pack the data of every transform moving in a straight line into
+        # contiguous arrays, and point each submobject's data at a slice
+        # of them, so that a frame is one lerp per kind of data instead of
+        # a Mobject.interpolate call per submobject
+        entries = []
+        fused_submobs = set()
+        for anim in self.animations:
+            if not self.can_fuse(anim, fused_submobs):
+                continue
+            for index, (submob, start, target) in enumerate(anim.families):
+                fused_submobs.add(id(submob))
+                entries.append((len(self.fused_anims), index, submob, start, target))
+            self.fused_anims.append(anim)
+
+        groups = dict()
+        self.fused_uniforms = []
+        self.fused_refreshes = []
+        for i, (anim_index, index, submob, start, target) in enumerate(entries):
+            for key, array in submob.data.items():
+                if self.is_interpolated(submob, start, target, key):
+                    groups.setdefault((key, array.shape[1:], array.dtype), []).append(i)
+            for key in submob.uniforms:
+                if np.any(start.uniforms[key] != target.uniforms[key]):
+                    self.fused_uniforms.append(
+                        (i, submob, key, start.uniforms[key], target.uniforms[key])
+                    )
+            if isinstance(submob, VMobject):
+                tri1 = start.get_triangulation()
+                tri2 = target.get_triangulation()
+                if len(tri1) != len(tri2) or not np.all(tri1 == tri2):
+                    self.fused_refreshes.append(submob)
+
+        self.fused_buffers = []
+        for (key, shape, dtype), indices in groups.items():
+            submobs = [entries[i][2] for i in indices]
+            buffer = np.concatenate([sm.data[key] for sm in submobs])
+            starts = np.concatenate([entries[i][3].data[key] for i in indices])
+            targets = np.concatenate([entries[i][4].data[key] for i in indices])
+            rows = np.repeat(indices, [len(sm.data[key]) for sm in submobs])
+            offset = 0
+            for sm in submobs:
+                length = len(sm.data[key])
+                sm.data[key] = buffer[offset : offset + length]
+                offset += length
+            self.fused_buffers.append((buffer, starts, targets, rows))
+
+        lengths = np.array([len(anim.families) for anim in self.fused_anims])
+        lag_ratios = np.array([anim.lag_ratio for anim in self.fused_anims])
+        self.fused_entry_anims = np.array([entry[0] for entry in entries], dtype=int)
+        full_lengths = (lengths - 1) * lag_ratios + 1
+        self.fused_entry_lengths = full_lengths[self.fused_entry_anims]
+        self.fused_entry_lowers = np.array(
+            [entry[1] * lag_ratios[entry[0]] for entry in entries]
+        )
+        ends = np.cumsum(lengths)
+        self.fused_entry_slices = [
+            slice(end - length, end) for end, length in zip(ends, lengths)
+        ]
+
+    def can_fuse(self, anim, fused_submobs):
+        anim_type = type(anim)
+        if not isinstance(anim, Transform) or anim.path_func is not straight_path:
+            return False
+        if (
+            anim_type.interpolate is not Animation.interpolate
+            or anim_type.interpolate_mobject is not Animation.interpolate_mobject
+            or anim_type.interpolate_submobject is not Transform.interpolate_submobject
+        ):
+            return False
+        for submob, start, target in anim.families:
+            if submob.has_updaters or id(submob) in fused_submobs:
+                return False
+            if type(submob).interpolate not in (
+                Mobject.interpolate,
+                VMobject.interpolate,
+            ):
+                return False
+            for key in submob.data:
+                if not self.is_interpolated(submob, start, target, key):
+                    continue
+                shapes = [mob.data[key].shape for mob in (submob, start, target)]
+                if shapes.count(shapes[0]) != 3:
+                    return False
+        return True
+
+    @staticmethod
+    def apply_rate_func(rate_func, alphas):
+        # Most rate functions are numpy expressions that take the whole
+        # array, the rest get called on each alpha
+        try:
+            values = np.asarray(rate_func(alphas), dtype=float)
+            if values.shape == alphas.shape:
+                return values
+        except (ValueError, TypeError):
+            pass
+        return np.array([rate_func(alpha) for alpha in alphas])
+
+    @staticmethod
+    def is_interpolated(submob, start, target, key):
+        # Same data Mobject.interpolate would write to
+        return not (
+            key in submob.locked_data_keys
+            or len(submob.data[key]) == 0
+            or key not in start.data
+            or key not in target.data
+        )
+
+    def interpolate(self, alpha):
+        if not self.animations_built:
+            if alpha >= 1 or self.skipped:
+                # Skipped plays go straight to their last frame, and the
+                # end state is all handled by clean_up_from_scene
+                self.skipped = True
+                return
+            self.build_animations()
+            self.begin_animations()
+        if not self.fused_anims:
+            super().interpolate(alpha)
+            return
+        time = alpha * self.max_end_time
+        anim_alphas = []
+        for anim, start_time, end_time in self.anims_with_timings:
+            anim_time = end_time - start_time
+            if anim_time == 0:
+                sub_alpha = 0
+            else:
+                sub_alpha = clip((time - start_time) / anim_time, 0, 1)
+            if anim in self.fused_anims:
+                if not RATE_FUNC_PER_SUBMOBJECT:
+                    sub_alpha = anim.rate_func(sub_alpha)
+                anim_alphas.append(sub_alpha)
+            else:
+                anim.interpolate(sub_alpha)
+
+        # Same lag as Animation.get_sub_alpha, for every fused submobject
+        alphas = np.array(anim_alphas)[self.fused_entry_anims]
+        alphas = alphas * self.fused_entry_lengths - self.fused_entry_lowers
+        alphas = np.clip(alphas, 0, 1)
+        if RATE_FUNC_PER_SUBMOBJECT:
+            for anim, entries in zip(self.fused_anims, self.fused_entry_slices):
+                alphas[entries] = self.apply_rate_func(anim.rate_func, alphas[entries])
+        for buffer, starts, targets, rows in self.fused_buffers:
+            row_alphas = alphas[rows].reshape((-1,) + (1,) * (buffer.ndim - 1))
+            buffer[:] = (1 - row_alphas) * starts + row_alphas * targets
+        for i, submob, key, value1, value2 in self.fused_uniforms:
+            submob.uniforms[key] = interpolate(value1, value2, alphas[i])
+        for submob in self.fused_refreshes:
+            if submob.has_fill():
+                submob.refresh_triangulation()
+
+    def get_matching(self, mobject, target_mobject, source_map=None, target_map=None):
+        # The parts of each group the transform is made of, as lists of the
+        # parts that share a key. Shape maps worked out before can be passed
+        # in, they get modified
+        if source_map is None:
+            source_map = self.get_shape_map(mobject)
+        if target_map is None:
+            target_map = self.get_shape_map(target_mobject)
+        if self.match_duplicates_by_distance:
+            self.split_duplicate_keys(mobject, target_mobject, source_map, target_map)
+
+        # Two groups whose submobjects all match each other according to
+        # whatever keys are used for source_map and target_map
+        matched_keys = set(source_map).intersection(target_map)
+        matching = {
+            "transform_source": [list(source_map[key]) for key in matched_keys],
+            "transform_target": [list(target_map[key]) for key in matched_keys],
+            "key_mapped_source": [],
+            "key_mapped_target": [],
+        }
+        # User can manually specify when one part should transform
+        # into another despite not matching by using key_map
+        for key1, key2 in self.key_map.items():
+            if key1 in source_map and key2 in target_map:
+                matching["key_mapped_source"].append(list(source_map.pop(key1)))
+                matching["key_mapped_target"].append(list(target_map.pop(key2)))
+
+        matching["fade_source"] = [
+            list(source_map[key]) for key in set(source_map).difference(target_map)
+        ]
+        matching["fade_target"] = [
+            list(target_map[key]) for key in set(target_map).difference(source_map)
+        ]
+        return matching
+
+    def get_group(self, part_lists):
+        return self.group_type(*(VGroup(*parts) for parts in part_lists))
+
+    def get_shape_map(self, mobject):
+        shape_map = {}
+        parts = self.get_mobject_parts(mobject)
+        for sm, key in zip(parts, self.get_mobject_keys(parts)):
+            if key not in shape_map:
+                shape_map[key] = VGroup()
+            shape_map[key].add(sm)
+        return shape_map
+
+    def split_duplicate_keys(self, mobject, target_mobject, source_map, target_map):
+        # Keys found more than once get split into single pieces, paired
+        # up by the optimal assignment over the distances between their
+        # centers (relative to the center of their mobject), so that each
+        # piece transforms into one piece instead of whole groups getting
+        # realigned into each other. Unpaired pieces are left to fade
+        mapped_keys = set(self.key_map).union(self.key_map.values())
+        for key in set(source_map).intersection(target_map).difference(mapped_keys):
+            sources = list(source_map[key])
+            targets = list(target_map[key])
+            if len(sources) == 1 and len(targets) == 1:
+                continue
+            centers1 = np.array([sm.get_center() for sm in sources])
+            centers2 = np.array([sm.get_center() for sm in targets])
+            centers1 -= mobject.get_center()
+            centers2 -= target_mobject.get_center()
+            costs = ((centers1[:, np.newaxis] - centers2[np.newaxis]) ** 2).sum(2)
+            rows, cols = linear_sum_assignment(costs)
+            del source_map[key]
+            del target_map[key]
+            for i, j in zip(rows, cols):
+                source_map[(key, i)] = VGroup(sources[i])
+                target_map[(key, i)] = VGroup(targets[j])
+            source_rest = [sm for i, sm in enumerate(sources) if i not in rows]
+            target_rest = [sm for j, sm in enumerate(targets) if j not in cols]
+            if source_rest:
+                source_map[key] = VGroup(*source_rest)
+            if target_rest:
+                target_map[key] = VGroup(*target_rest)
+
+    def clean_up_from_scene(self, scene):
+        start_time = time.perf_counter()
+        # Children that finished at alpha 0 are already back at their
+        # start. Only the ones that finished elsewhere and touch the source,
+        # which might get shown again later, need to be reset
+        source_family = set(self.to_remove.get_family())
+        for anim in self.animations:
+            if anim.final_alpha_value == 0:
+                continue
+            if source_family.intersection(anim.mobject.get_family()):
+                anim.update(0)
+        scene.remove(self.mobject)
+        scene.remove(self.to_remove)
+        scene.add(self.to_add)
+        if self.collect_stats:
+            self.stats["clean_up"] = time.perf_counter() - start_time
+            if not hasattr(scene, "transform_matching_stats"):
+                scene.transform_matching_stats = []
+                TRANSFORM_MATCHING_SCENES.append(scene)
+            scene.transform_matching_stats.append(self.stats)
+
+    @staticmethod
+    def get_stats_name(mobject, target_mobject):
+        names = [
+            getattr(mob, "tex_string", mob.__class__.__name__)
+            for mob in (mobject, target_mobject)
+        ]
+        return " -> ".join(
+            name if len(name) < 40 else name[:37] + "..." for name in names
+        )
+
+    @staticmethod
+    def get_mobject_parts(mobject):
+        # To be implemented in subclass
+        return mobject
+
+    @staticmethod
+    def get_mobject_key(mobject):
+        # To be implemented in subclass
+        return hash(mobject)
+
+    @classmethod
+    def get_mobject_keys(cls, parts):
+        # Subclasses can compute all the keys of a mobject at once
+        return [cls.get_mobject_key(sm) for sm in parts]
+
+
+# Scenes that TransformMatchingPartsJ collected stats in, logged on exit
+TRANSFORM_MATCHING_SCENES = []
+
+
+@atexit.register
+def log_all_transform_matching_stats():
+    for scene in TRANSFORM_MATCHING_SCENES:
+        log.info(f"Transform matching stats of {scene}:")
+        log_transform_matching_stats(scene)
+
+
+def log_transform_matching_stats(scene):
+    # Logs what TransformMatchingPartsJ(..., collect_stats=True) collected
+    # over the scene, most expensive transforms first
+    stats = getattr(scene, "transform_matching_stats", [])
+    stats = sorted(
+        stats, key=lambda stat: stat["get_shape_map"] + stat["clean_up"], reverse=True
+    )
+    for stat in stats:
+        log.info(
+            f"{stat['name']}: "
+            f"get_shape_map {stat['get_shape_map'] * 1000:.2f} ms, "
+            f"clean_up {stat['clean_up'] * 1000:.2f} ms, "
+            f"{stat['matched']} matched, "
+            f"{stat['key_mapped']} key mapped, "
+            f"{stat['faded']} faded, "
+            f"{stat.get('points_per_frame', 0)} points per frame"
+        )
+
+
+class TransformMatchingTexJ(TransformMatchingPartsJ):
+    CONFIG = {
+        "mobject_type": VMobject,
+        "group_type": VGroup,
+    }
+
+    @staticmethod
+    def get_mobject_parts(mobject):
+        return mobject.submobjects
+
+    @staticmethod
+    def get_mobject_key(mobject):
+        return mobject.get_tex()
+
+
+# Shape keys by digest of the raw points, shared by every transform
+SHAPE_KEY_CACHE = {}
+
+
+class TransformMatchingShapesJ(TransformMatchingPartsJ):
+    CONFIG = {
+        "mobject_type": VMobject,
+        "group_type": VGroup,
+    }
+
+    @staticmethod
+    def get_mobject_parts(mobject):
+        return mobject.family_members_with_points()
+
+    @staticmethod
+    def get_mobject_key(mobject):
+        return TransformMatchingShapesJ.get_mobject_keys([mobject])[0]
+
+    @classmethod
+    def get_mobject_keys(cls, parts):
+        # Same key as centering, setting the height to 1 and hashing the
+        # rounded points, but done for every piece in one pass over the
+        # concatenated point arrays, and only for digests not seen before
+        point_arrays = [sm.get_points() for sm in parts]
+        digests = [hash(points.tobytes()) for points in point_arrays]
+        missing = {}
+        for digest, points in zip(digests, point_arrays):
+            if digest not in SHAPE_KEY_CACHE:
+                missing[digest] = points
+        if missing:
+            lengths = np.array([len(points) for points in missing.values()])
+            offsets = np.cumsum(lengths) - lengths
+            all_points = np.vstack(list(missing.values()))
+            lows = np.minimum.reduceat(all_points, offsets)
+            highs = np.maximum.reduceat(all_points, offsets)
+            heights = highs[:, 1] - lows[:, 1]
+            heights[heights == 0] = 1
+            all_points = all_points - np.repeat((lows + highs) / 2, lengths, axis=0)
+            all_points /= np.repeat(heights, lengths)[:, np.newaxis]
+            all_points = np.round(all_points, 3) + 0.0
+            for digest, points in zip(missing, np.split(all_points, offsets[1:])):
+                SHAPE_KEY_CACHE[digest] = hash(points.tobytes())
+        return [SHAPE_KEY_CACHE[digest] for digest in digests]
+
+
+# Options of TransformMatchingPartsJ that change what get_matching returns
+MATCHING_OPTIONS = {"key_map", "match_duplicates_by_distance"}
+
+
+class TransformMatchingChainJ(object):
+    # Works out the matching of every step of a sequence of
+    # TransformMatchingTexJ before the first play, and aligns copies of the
+    # parts each step transforms so ALIGNED_POINTS_CACHE already holds their
+    # points. Playing step i then only builds its groups and interpolates.
+    # The matchings hold the parts of the states, which shouldn't be
+    # replaced in between
+    def __init__(
+        self, *states, key_maps=None, step_class=TransformMatchingTexJ, **kwargs
+    ):
+        self.states = states
+        self.key_maps = key_maps or dict()
+        self.step_class = step_class
+        self.kwargs = kwargs
+        self.shape_maps = dict()
+        self.matchings = [self.plan_step(i) for i in range(len(states) - 1)]
+
+    def __len__(self):
+        return len(self.matchings)
+
+    def __getitem__(self, index):
+        return self.step(index)
+
+    def get_step_config(self, index):
+        return dict(self.kwargs, key_map=self.key_maps.get(index, dict()))
+
+    def plan_step(self, index):
+        planner = self.step_class.__new__(self.step_class)
+        digest_config(planner, self.get_step_config(index))
+        matching = planner.get_matching(
+            self.states[index],
+            self.states[index + 1],
+            self.get_shape_map(planner, index),
+            self.get_shape_map(planner, index + 1),
+        )
+        if not issubclass(planner.transform_class, AlignCachedTransform):
+            # Nothing would read the aligned points
+            return matching
+
+        pairs = [("transform_source", "transform_target")]
+        if planner.transform_mismatches:
+            pairs.append(("fade_source", "fade_target"))
+        for source_name, target_name in pairs:
+            source, target = (
+                planner.get_group(
+                    [[part.copy() for part in parts] for parts in matching[name]]
+                )
+                for name in [source_name, target_name]
+            )
+            source.align_family(target)
+            AlignCachedTransform.align_data(source, target)
+        return matching
+
+    def get_shape_map(self, planner, index):
+        # Every state but the ends is the target of one step and the source
+        # of the next, its parts only get keyed once
+        if index not in self.shape_maps:
+            self.shape_maps[index] = planner.get_shape_map(self.states[index])
+        return dict(self.shape_maps[index])
+
+    def step(self, index, **kwargs):
+        config = dict(self.get_step_config(index), **kwargs)
+        # The planned matching only holds for the options it was planned with
+        if not MATCHING_OPTIONS.intersection(kwargs):
+            config["matching"] = self.matchings[index]
+        return self.step_class(self.states[index], self.states[index + 1], **config)
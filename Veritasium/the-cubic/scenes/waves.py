@@ -1,7 +1,12 @@
+import os
+import sys
 from re import X
 from manimlib import *
 from numpy import fabs
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from tex_cache import Tex
+
 
 class WavesBothAxis(Scene):
     def construct(self):
@@ -0,0 +1,141 @@
+import importlib.util
+import os
+import time
+from manimlib import *
+from manimlib.logger import log
+
+# Scene files aren't importable as modules, so load the Bombelli scenes by path
+spec = importlib.util.spec_from_file_location(
+    "bombellis_grinding",
+    os.path.join(os.path.dirname(__file__), "..", "scenes", "bombellis_grinding.py"),
+)
+bombellis_grinding = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bombellis_grinding)
+TransformMatchingTexJ = bombellis_grinding.TransformMatchingTexJ
+PIECES_TRANSFORM_CONFIG = bombellis_grinding.PIECES_TRANSFORM_CONFIG
+
+
+def legacy_clean_up(transform, scene):
+    # clean_up_from_scene as it was, resetting every child animation
+    for anim in transform.animations:
+        anim.update(0)
+    scene.remove(transform.mobject)
+    scene.remove(transform.to_remove)
+    scene.add(transform.to_add)
+
+
+class BombelliCleanupBench(Scene):
+    CONFIG = {
+        "repeats": 20,
+    }
+
+    def construct(self):
+        eq_1 = Tex(
+            R"\sqrt[3]{\frac d2+\sqrt{\frac{d^2}4-\frac{c^3}{27}}}",
+            R"+\sqrt[3]{\frac d2-\sqrt{\frac{d^2}4-\frac{c^3}{27}}}",
+        ).set_color(BLACK)
+
+        sustitution = Tex(
+            R"\sqrt[3]{\frac 42+\sqrt{\frac{4^2}4-\frac{15^3}{27}}}",
+            R"+\sqrt[3]{\frac 42-\sqrt{\frac{4^2}4-\frac{15^3}{27}}}",
+        ).set_color(BLACK)
+
+        simplify_1 = Tex(
+            R"\sqrt[3]{2+\sqrt{4-125}} +\sqrt[3]{2-\sqrt{4-125}}"
+        ).set_color(BLACK)
+
+        separation = Tex(
+            R"\sqrt[3]{ ",
+            R"2 + \sqrt{-121}",
+            "}",
+            R" \rightarrow ",
+            R"a + b \sqrt{-11} ",
+        ).set_color(BLACK)
+
+        cube_sides = Tex(
+            R"2 + \sqrt{-121}", "=", R"(a+b\sqrt{-1})(a+b\sqrt{-1})(a+b\sqrt{-1})"
+        ).set_color(BLACK)
+
+        equals = Tex(R"(a^2+2ab\sqrt{-1}+b^2(\sqrt{-1})^2)(a+b\sqrt{-1})").set_color(
+            BLACK
+        )
+
+        simplify_2 = Tex(
+            R"2+\sqrt{-121} = a^3-3ab^2+3a^2b\sqrt{-1}-b^3\sqrt{-1}"
+        ).set_color(BLACK)
+
+        separate_equations = Tex(
+            R"2=a^3-3ab^2 \\ \sqrt{-121}=3a^2b\sqrt{-1}-b^3\sqrt{-1}"
+        ).set_color(BLACK)
+
+        separate_equations_2 = Tex(
+            R"11 \sqrt{-1} =b \sqrt{-1}(3a^2-b^2) \\ 11=b(3a^2-b^2)"
+        ).set_color(BLACK)
+
+        separate_equations_3 = Tex(R"2=a^3-3ab^2 \\ 11=b(3a^2-b^2)").set_color(BLACK)
+
+        meaning = Tex(
+            R"\sqrt[3]{2+\sqrt{-121}}=2+\sqrt{-1} \\ \sqrt[3]{2-\sqrt{-121}}=2-\sqrt{-1}"
+        ).set_color(BLACK)
+        final_step = Tex(R"(2+\sqrt{-1}) + (2-\sqrt{-1})=4").set_color(BLACK)
+
+        steps = [
+            ("eq_1", eq_1, sustitution, dict()),
+            ("sustitution", sustitution, simplify_1, dict()),
+            ("simplify_1", simplify_1, separation, dict()),
+            (
+                "cube_sides",
+                cube_sides,
+                equals,
+                {
+                    R"(a+b\sqrt{-1})(a+b\sqrt{-1})(a+b\sqrt{-1})": R"(a^2+2ab\sqrt{-1}+b^2(\sqrt{-1})^2)(a+b\sqrt{-1})"
+                },
+            ),
+            ("equals", equals, simplify_2, dict()),
+            ("simplify_2", simplify_2, separate_equations, dict()),
+            ("separate_equations", separate_equations, separate_equations_2, dict()),
+            (
+                "separate_equations_2",
+                separate_equations_2,
+                separate_equations_3,
+                dict(),
+            ),
+            ("separate_equations_3", separate_equations_3, meaning, dict()),
+            ("meaning", meaning, final_step, dict()),
+        ]
+
+        clean_ups = [legacy_clean_up, TransformMatchingTexJ.clean_up_from_scene]
+        totals = [0, 0]
+        for name, source, target, key_map in steps:
+            timings = [
+                self.time_clean_up(source, target, key_map, clean_up)
+                for clean_up in clean_ups
+            ]
+            totals = [total + timing for total, timing in zip(totals, timings)]
+            log.info(
+                f"{name}: {timings[0] * 1000:.3f} ms -> {timings[1] * 1000:.3f} ms"
+            )
+        log.info(f"Total: {totals[0] * 1000:.3f} ms -> {totals[1] * 1000:.3f} ms")
+
+    def time_clean_up(self, source, target, key_map, clean_up):
+        # Run the transform through to the end without rendering, then
+        # time the clean up on its own
+        source = source.copy()
+        target = target.copy()
+        transform = TransformMatchingTexJ(
+            source,
+            target,
+            key_map=key_map,
+            lazy_animations=False,
+            **PIECES_TRANSFORM_CONFIG,
+        )
+        self.add(source)
+        transform.begin()
+        transform.interpolate(1)
+        transform.finish()
+        start = time.perf_counter()
+        for _ in range(self.repeats):
+            clean_up(transform, self)
+        result = (time.perf_counter() - start) / self.repeats
+        self.clear()
+        return result
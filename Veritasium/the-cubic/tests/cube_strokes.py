@@ -1,8 +1,31 @@
+from collections import OrderedDict
 from math import fabs
 from manimlib import *
 from numpy import cbrt, ndarray, sqrt
 
 
+# Bezier control points of the faces of a cube of side 1, in the order VCube
+# adds them, each the square at z = 1/2 turned to face its direction
+UNIT_SQUARE_CORNERS = np.array([UR, UL, DL, DR, UR]) / 2 + OUT / 2
+UNIT_CUBE_FACES = np.einsum(
+    "kij,nj->kni",
+    np.array([z_to_vector(vect) for vect in [IN, OUT, LEFT, RIGHT, UP, DOWN]]),
+    np.stack(
+        [
+            interpolate(UNIT_SQUARE_CORNERS[:-1], UNIT_SQUARE_CORNERS[1:], alpha)
+            for alpha in np.linspace(0, 1, 3)
+        ],
+        axis=1,
+    ).reshape((-1, 3)),
+)
+
+# Faces of VCube and VPrism by their size and style, so a box built again
+# copies them instead of building and triangulating new ones, least
+# recently used first
+VCUBE_FACES = OrderedDict()
+VCUBE_FACES_SIZE = 64
+
+
 class VCube(VGroup):
     CONFIG = {
         "color": BLUE,
@@ -29,30 +52,54 @@ class VCube(VGroup):
         )
 
     def init_points(self):
-        for vect in IN, OUT, LEFT, RIGHT, UP, DOWN:
-            face = (
-                Square(
-                    side_length=self.side_length,
-                    # shade_in_3d=True,
-                )
-                .set_stroke(self.stroke_color, width=self.stroke_width)
-                .set_opacity(self.fill_opacity)
-                .set_fill(self.fill_color)
-            )
-            # face.flip()
-            face.shift(self.side_length * OUT / 2.0)
-            face.apply_matrix(z_to_vector(vect))
-
-            self.add(face)
+        key = self.get_faces_key()
+        if key in VCUBE_FACES:
+            VCUBE_FACES.move_to_end(key)
+            # Copies keep the triangulation of the cached faces
+            self.add(*(face.copy() for face in VCUBE_FACES[key]))
+            return
+        self.add_faces()
+        VCUBE_FACES[key] = [face.copy() for face in self.submobjects]
+        if len(VCUBE_FACES) > VCUBE_FACES_SIZE:
+            VCUBE_FACES.popitem(last=False)
+
+    def get_faces_key(self):
+        return (
+            self.side_length,
+            self.fill_color,
+            self.fill_opacity,
+            self.stroke_color,
+            self.stroke_width,
+        )
+
+    def get_dimensions(self):
+        return [self.side_length] * 3
+
+    def add_faces(self):
+        # All six faces scaled in one step into a single array, then handed
+        # to copies of one styled face
+        points = np.empty(UNIT_CUBE_FACES.shape)
+        np.multiply(UNIT_CUBE_FACES, self.get_dimensions(), out=points)
+        face = VMobject(
+            fill_color=self.fill_color,
+            fill_opacity=self.fill_opacity,
+            stroke_color=self.stroke_color,
+            stroke_width=self.stroke_width,
+            stroke_opacity=self.fill_opacity,
+        )
+        for face_points in points:
+            self.add(face.copy())
+            self[-1].set_points(face_points)
 
 
 class VPrism(VCube):
     CONFIG = {"dimensions": [3, 2, 1]}
 
-    def init_points(self):
-        VCube.init_points(self)
-        for dim, value in enumerate(self.dimensions):
-            self.rescale_to_fit(value, dim, stretch=True)
+    def get_faces_key(self):
+        return (*VCube.get_faces_key(self), tuple(self.dimensions))
+
+    def get_dimensions(self):
+        return self.dimensions
 
 
 class VCubeTest(ThreeDScene):
@@ -1,78 +1,36 @@
-from itertools import product
+import os
+import sys
+from collections import OrderedDict
 from manimlib import *
-import colorsys
 from numpy import ndarray
 
-
-class JLine3D(Prism):
-    CONFIG = {"width": 0.05, "resolution": (21, 25)}
-
-    def __init__(self, start, end, **kwargs):
-        digest_config(self, kwargs)
-        axis = end - start
-        super().__init__(height=get_norm(axis), radius=self.width / 2, axis=axis)
-        self.shift((start + end) / 2)
-
-
-def xor(tup_a, tup_b):
-    return tuple(a ^ b for a, b in zip(tup_a, tup_b))
-
-
-def scale_lightness(rgb, scale_l):
-
-    if isinstance(rgb, str):
-        rgb = hex_to_rgb(rgb)
-    # convert rgb to hls
-    h, l, s = colorsys.rgb_to_hls(*rgb)
-    # manipulate h, l, s values and return as rgb
-    return rgb_to_hex(colorsys.hls_to_rgb(h, min(1, l * scale_l), s=s))
-
-
-class JPrism(Group):
-    def __init__(self, dimensions=[1, 2, 3], fill_color=BLUE, stroke_color=BLACK):
-        self.prism = Prism(dimensions=dimensions).set_color(fill_color)
-
-        vertices = list(product([0, 1], repeat=3))
-
-        edges = []
-
-        for v1 in vertices:
-            for v2 in vertices:
-                if v1 != v2 and sum(xor(v1, v2)) < 2:
-
-                    l = (
-                        Line3D(
-                            start=self.prism.get_corner(np.array(v1)),
-                            end=self.prism.get_corner(np.array(v2)),
-                            width=0.002,
-                            gloss=-1,
-                        )
-                        .set_color(
-                            scale_lightness(fill_color, 0.3)
-                            if stroke_color is None
-                            else stroke_color
-                        )
-                        .set_gloss(-1, recurse=True)
-                    )
-
-                    edges.append(l)
-
-        self.edges = Group(*edges)
-        for dim, value in enumerate(self.prism.dimensions):
-            self.edges.rescale_to_fit(value + 0.0050, dim, stretch=True)
-
-        self.edges.move_to(self.prism.get_center())
-
-        super().__init__(self.prism, *self.edges)
-
-
-class JCube(JPrism):
-    def __init__(self, side_length=2, fill_color=BLUE, stroke_color=BLACK):
-        super().__init__(
-            dimensions=[side_length, side_length, side_length],
-            fill_color=fill_color,
-            stroke_color=stroke_color,
-        )
+# The cube scenes import their prisms from the scenes folder
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scenes")
+)
+from prisms import JCube, JPrism
+
+
+# Bezier control points of the faces of a cube of side 1, in the order VCube
+# adds them, each the square at z = 1/2 turned to face its direction
+UNIT_SQUARE_CORNERS = np.array([UR, UL, DL, DR, UR]) / 2 + OUT / 2
+UNIT_CUBE_FACES = np.einsum(
+    "kij,nj->kni",
+    np.array([z_to_vector(vect) for vect in [IN, OUT, LEFT, RIGHT, UP, DOWN]]),
+    np.stack(
+        [
+            interpolate(UNIT_SQUARE_CORNERS[:-1], UNIT_SQUARE_CORNERS[1:], alpha)
+            for alpha in np.linspace(0, 1, 3)
+        ],
+        axis=1,
+    ).reshape((-1, 3)),
+)
+
+# Faces of VCube and VPrism by their size and style, so a box built again
+# copies them instead of building and triangulating new ones, least
+# recently used first
+VCUBE_FACES = OrderedDict()
+VCUBE_FACES_SIZE = 64
 
 
 class VCube(VGroup):
@@ -101,30 +59,54 @@ class VCube(VGroup):
         )
 
     def init_points(self):
-        for vect in IN, OUT, LEFT, RIGHT, UP, DOWN:
-            face = (
-                Square(
-                    side_length=self.side_length,
-                    # shade_in_3d=True,
-                )
-                .set_stroke(self.stroke_color, width=self.stroke_width)
-                .set_opacity(self.fill_opacity)
-                .set_fill(self.fill_color)
-            )
-            # face.flip()
-            face.shift(self.side_length * OUT / 2.0)
-            face.apply_matrix(z_to_vector(vect))
+        key = self.get_faces_key()
+        if key in VCUBE_FACES:
+            VCUBE_FACES.move_to_end(key)
+            # Copies keep the triangulation of the cached faces
+            self.add(*(face.copy() for face in VCUBE_FACES[key]))
+            return
+        self.add_faces()
+        VCUBE_FACES[key] = [face.copy() for face in self.submobjects]
+        if len(VCUBE_FACES) > VCUBE_FACES_SIZE:
+            VCUBE_FACES.popitem(last=False)
+
+    def get_faces_key(self):
+        return (
+            self.side_length,
+            self.fill_color,
+            self.fill_opacity,
+            self.stroke_color,
+            self.stroke_width,
+        )
 
-            self.add(face)
+    def get_dimensions(self):
+        return [self.side_length] * 3
+
+    def add_faces(self):
+        # All six faces scaled in one step into a single array, then handed
+        # to copies of one styled face
+        points = np.empty(UNIT_CUBE_FACES.shape)
+        np.multiply(UNIT_CUBE_FACES, self.get_dimensions(), out=points)
+        face = VMobject(
+            fill_color=self.fill_color,
+            fill_opacity=self.fill_opacity,
+            stroke_color=self.stroke_color,
+            stroke_width=self.stroke_width,
+            stroke_opacity=self.fill_opacity,
+        )
+        for face_points in points:
+            self.add(face.copy())
+            self[-1].set_points(face_points)
 
 
 class VPrism(VCube):
     CONFIG = {"dimensions": [3, 2, 1]}
 
-    def init_points(self):
-        VCube.init_points(self)
-        for dim, value in enumerate(self.dimensions):
-            self.rescale_to_fit(value, dim, stretch=True)
+    def get_faces_key(self):
+        return (*VCube.get_faces_key(self), tuple(self.dimensions))
+
+    def get_dimensions(self):
+        return self.dimensions
 
 
 class RotatingAndMove(Animation):
@@ -236,13 +218,13 @@ class _17_CubicExplanation(ThreeDScene):
         x = 2
         y = 1
         z = x + y
-        x_cube = JCube(side_length=x, fill_color=PURPLE).shift(ORIGIN)
-        y_cube = JCube(side_length=y, fill_color=YELLOW_D).next_to(
+        x_cube = JCube(side_length=x, fill_color=PURPLE, merge_edges=True).shift(ORIGIN)
+        y_cube = JCube(side_length=y, fill_color=YELLOW_D, merge_edges=True).next_to(
             x_cube, DOWN + OUT + LEFT, buff=0
         )
 
         z_cube_og = (
-            JCube(side_length=z, fill_color=RED_C)
+            JCube(side_length=z, fill_color=RED_C, merge_edges=True)
             .next_to(x_cube, buff=0, aligned_edge=IN + UP + LEFT, coor_mask=[0, 1, 1])
             .shift(LEFT * y / 2)
             .shift(IN * 0.02)  # to avoid glitches
@@ -251,19 +233,19 @@ class _17_CubicExplanation(ThreeDScene):
         # x, y, y prisms
         ####################################################
         x_y_y = (
-            JPrism(dimensions=[x, y, y], fill_color=GREEN).next_to(
+            JPrism(dimensions=[x, y, y], fill_color=GREEN, merge_edges=True).next_to(
                 x_cube, OUT + DOWN, buff=0
             )
         ).set_opacity(general_opacity)
 
         x_y_y_1 = (
-            (JPrism(dimensions=[x, y, y], fill_color=GREEN))
+            (JPrism(dimensions=[x, y, y], fill_color=GREEN, merge_edges=True))
             .rotate(PI / 2, Z_AXIS)
             .next_to(x_cube, OUT + LEFT, buff=0)
         ).set_opacity(general_opacity)
 
         x_y_y_2 = (
-            JPrism(dimensions=[y, y, x], fill_color=GREEN)
+            JPrism(dimensions=[y, y, x], fill_color=GREEN, merge_edges=True)
             .rotate(0)
             .next_to(x_cube, LEFT + DOWN, buff=0)
         ).set_opacity(general_opacity)
@@ -271,18 +253,18 @@ class _17_CubicExplanation(ThreeDScene):
         # x, x, y prisms
         ####################################################
         x_x_y = (
-            JPrism(dimensions=[x, x, y], fill_color=BLUE_D)
+            JPrism(dimensions=[x, x, y], fill_color=BLUE_D, merge_edges=True)
             .next_to(x_cube, OUT, buff=0)
             .set_opacity(general_opacity)
         )
         x_x_y_1 = (
-            JPrism(dimensions=[x, x, y], fill_color=BLUE_D)
+            JPrism(dimensions=[x, x, y], fill_color=BLUE_D, merge_edges=True)
             .rotate(PI / 2, Y_AXIS)
             .next_to(x_cube, LEFT, buff=0)
         ).set_opacity(general_opacity)
 
         x_x_y_2 = (
-            JPrism(dimensions=[x, x, y], fill_color=BLUE_D)
+            JPrism(dimensions=[x, x, y], fill_color=BLUE_D, merge_edges=True)
             .rotate(PI / 2, X_AXIS)
             .next_to(x_cube, DOWN, buff=0)
         ).set_opacity(general_opacity)
@@ -490,7 +472,7 @@ class _17_CubicExplanation(ThreeDScene):
         )
         self.wait(3)
 
-        ref_cube = JCube().shift(LEFT * 4)
+        ref_cube = JCube(merge_edges=True).shift(LEFT * 4)
 
         self.play(
             LaggedStart(
@@ -0,0 +1,100 @@
+import os
+import sys
+from manimlib import *
+from manimlib.logger import log
+
+# The cube scenes import their prisms from the scenes folder, VCube is the
+# one of the stroke tests next to this file
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scenes")
+)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from cube_strokes import VCube, VPrism
+from prisms import JBox, JLine3D, LODScene
+
+
+def get_old_vcube_faces(side_length):
+    # The faces VCube used to build, a Square turned to face each direction
+    faces = []
+    for vect in IN, OUT, LEFT, RIGHT, UP, DOWN:
+        face = Square(side_length=side_length)
+        face.shift(side_length * OUT / 2.0)
+        face.apply_matrix(z_to_vector(vect))
+        faces.append(face)
+    return VGroup(*faces)
+
+
+class PrismChecks(LODScene):
+    # Checks that the cached and merged boxes look like the ones they replace
+    def construct(self):
+        checks = [
+            self.check_jbox_points,
+            self.check_lod_buckets,
+            self.check_vcube_faces,
+        ]
+        for check in checks:
+            check()
+            log.info(f"{check.__name__}: ok")
+
+    def check_jbox_points(self):
+        # A JBox is the six faces of a Prism of its dimensions, one after
+        # the other, with the same triangles
+        for dimensions in [[3, 2, 1], [1, 1, 1], [0.5, 2, 4]]:
+            box = JBox(dimensions=dimensions)
+            faces = Prism(dimensions=dimensions).submobjects
+            face_points = zip(
+                *(face.get_surface_points_and_nudged_points() for face in faces)
+            )
+            for points, face_arrays in zip(
+                box.get_surface_points_and_nudged_points(), face_points
+            ):
+                assert np.allclose(points, np.vstack(face_arrays))
+            assert np.array_equal(
+                box.get_triangle_indices(),
+                np.hstack(
+                    [
+                        face.get_triangle_indices() + i * face.get_num_points() // 3
+                        for i, face in enumerate(faces)
+                    ]
+                ),
+            )
+
+    def check_lod_buckets(self):
+        # A wide line close up takes the most sides. Seen from far enough
+        # away it takes the fewest, and it's only rebuilt when that changes,
+        # keeping its ends and width
+        line = JLine3D(LEFT, RIGHT, width=0.5)
+        width = line.get_line_width()
+        self.add(line)
+        self.update_line_resolutions()
+        assert tuple(line.resolution) == (line.lod_sides[-1] + 1, 2)
+        assert not self.update_line_resolutions()
+
+        self.camera.frame.scale(64)
+        assert self.update_line_resolutions()
+        assert tuple(line.resolution) == (line.lod_sides[0] + 1, 2)
+        assert not self.update_line_resolutions()
+        start, end = (ring.mean(0) for ring in line.get_rings())
+        assert np.allclose([start, end], [LEFT, RIGHT])
+        assert np.isclose(line.get_line_width(), width)
+
+        self.camera.frame.scale(1 / 64)
+        self.remove(line)
+
+    def check_vcube_faces(self):
+        # VCube and VPrism put their faces where turning a Square for each
+        # one did, whether they're built or copied from the cache
+        for side_length in [2, 2, 0.5]:
+            cube = VCube(side_length=side_length)
+            old_faces = get_old_vcube_faces(side_length)
+            assert len(cube) == len(old_faces)
+            for face, old_face in zip(cube, old_faces):
+                assert np.allclose(face.get_points(), old_face.get_points())
+
+        for dimensions in [[3, 2, 1], [3, 2, 1]]:
+            prism = VPrism(dimensions=dimensions)
+            old_faces = get_old_vcube_faces(2)
+            for dim, value in enumerate(dimensions):
+                old_faces.rescale_to_fit(value, dim, stretch=True)
+            for face, old_face in zip(prism, old_faces):
+                assert np.allclose(face.get_points(), old_face.get_points())
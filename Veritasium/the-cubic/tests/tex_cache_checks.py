@@ -0,0 +1,57 @@
+import os
+import sys
+from manimlib import *
+from manimlib.logger import log
+
+# The scene files import their Tex from the scenes folder
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scenes")
+)
+from tex_cache import LazyTex, Tex, Text, get_text_glyphs
+
+
+class TexCacheChecks(Scene):
+    # Checks that the Tex of tex_cache still behave like manimlib's
+    def construct(self):
+        checks = [
+            self.check_single_string_colors,
+            self.check_lazy_tex_placement,
+            self.check_text_glyph_cache,
+        ]
+        for check in checks:
+            check()
+            log.info(f"{check.__name__}: ok")
+
+    def check_single_string_colors(self):
+        # The only part of a single string Tex is a copy of the Tex itself
+        tex = Tex("a+b").set_color_by_tex("a", RED)
+        assert len(tex.get_parts_by_tex("a")) == 1
+        assert len(tex.get_parts_by_tex("c")) == 0
+        for glyph in tex.family_members_with_points():
+            assert np.allclose(color_to_rgb(glyph.get_color()), color_to_rgb(RED))
+
+    def check_lazy_tex_placement(self):
+        # A LazyTex laid out before it's built, from the box stored by an
+        # earlier one, ends up where the Tex it stands in for would be
+        tex_strings = ["x^3", "=", "15x+4"]
+        LazyTex(*tex_strings).materialize()
+        lazy = LazyTex(*tex_strings).scale(1.5).to_edge(LEFT).shift(UP)
+        assert not lazy.is_materialized()
+        tex = Tex(*tex_strings).scale(1.5).to_edge(LEFT).shift(UP)
+        lazy.materialize()
+        assert len(lazy.get_family()) == len(tex.get_family())
+        for mob1, mob2 in zip(lazy.get_family(), tex.get_family()):
+            assert np.allclose(mob1.get_points(), mob2.get_points())
+
+    def check_text_glyph_cache(self):
+        # A Text put together from cached outlines has the points of one
+        # parsed from pango's svg
+        string = "abba cab"
+        key = Text(string).text2hash()
+        get_text_glyphs()["layouts"].pop(key, None)
+        parsed = Text(string)
+        assert key in get_text_glyphs()["layouts"]
+        cached = Text(string)
+        assert len(cached) == len(parsed) > 0
+        for mob1, mob2 in zip(parsed, cached):
+            assert np.allclose(mob1.get_points(), mob2.get_points())
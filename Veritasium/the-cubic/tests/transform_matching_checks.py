@@ -0,0 +1,166 @@
+import os
+import sys
+from manimlib import *
+from manimlib.logger import log
+
+# The scene files import their transforms from the scenes folder
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scenes")
+)
+from tex_cache import Tex
+from transform_matching import (
+    ALIGNED_POINTS_CACHE,
+    AlignCachedTransform,
+    TransformMatchingChainJ,
+    TransformMatchingShapesJ,
+    TransformMatchingTexJ,
+)
+
+
+class TransformMatchingChecks(Scene):
+    # Checks that the shortcuts of TransformMatchingPartsJ draw the same
+    # frames as the plain child animations
+    def construct(self):
+        checks = [
+            self.check_fused_frame,
+            self.check_lazy_timings,
+            self.check_duplicates_by_distance,
+            self.check_chain,
+            self.check_aligned_points_cache,
+        ]
+        for check in checks:
+            check()
+            log.info(f"{check.__name__}: ok")
+
+    def check_fused_frame(self):
+        # One frame half way through, with a lag and a curved rate_func so
+        # that the order they are applied in shows
+        source = Tex("a", "+", "b", "=", "c").set_color(BLACK)
+        target = Tex("b", "+", "a", "=", "c").set_color(RED).shift(UP)
+        frames = []
+        for fuse_interpolation in [True, False]:
+            transform = TransformMatchingTexJ(
+                source.copy(),
+                target.copy(),
+                fuse_interpolation=fuse_interpolation,
+                lag_ratio=0.2,
+                rate_func=smooth,
+            )
+            transform.begin()
+            transform.interpolate(0.4)
+            assert bool(transform.fused_anims) == fuse_interpolation
+            frames.append(transform.mobject.copy())
+            transform.finish()
+        fused, unfused = (frame.get_family() for frame in frames)
+        assert len(fused) == len(unfused)
+        for mob1, mob2 in zip(fused, unfused):
+            for key in mob1.data:
+                assert np.allclose(mob1.data[key], mob2.data[key])
+
+    def check_lazy_timings(self):
+        # Child animations built on the first frame start and end when the
+        # ones built up front do, and draw the same frame
+        source = Tex("a", "+", "b", "=", "c").set_color(BLACK)
+        target = Tex("c", "-", "b", "=", "a", "+", "d").shift(UP)
+        lazy, eager = (
+            TransformMatchingTexJ(
+                source.copy(),
+                target.copy(),
+                lazy_animations=lazy_animations,
+                key_map={"+": "-"},
+                fade_out_run_time=0.5,
+                lag_ratio=0.2,
+            )
+            for lazy_animations in [True, False]
+        )
+        assert lazy.run_time == eager.run_time
+        assert lazy.lazy_timings == [
+            (start, end) for anim, start, end in eager.anims_with_timings
+        ]
+        frames = []
+        for transform in [lazy, eager]:
+            transform.begin()
+            transform.interpolate(0.3)
+            frames.append(transform.mobject.copy())
+            transform.finish()
+        assert lazy.anims_with_timings == [
+            (anim, start, end)
+            for anim, (start, end) in zip(lazy.animations, lazy.lazy_timings)
+        ]
+        lazy_family, eager_family = (frame.get_family() for frame in frames)
+        assert len(lazy_family) == len(eager_family)
+        for mob1, mob2 in zip(lazy_family, eager_family):
+            assert np.allclose(mob1.get_points(), mob2.get_points())
+
+    def check_duplicates_by_distance(self):
+        # Each repeated part goes to the copy at the same place in the
+        # target, instead of all of them transforming as one group. The
+        # target is laid out backwards, so order alone would pair the
+        # squares the wrong way round
+        source = VGroup(Square(), Circle(), Square()).arrange(RIGHT)
+        target = VGroup(Square(), Triangle(), Square()).arrange(LEFT).shift(UP)
+        grouped = TransformMatchingShapesJ(source, target)
+        assert [len(group) for group in grouped.transform_source] == [2]
+        transform = TransformMatchingShapesJ(
+            source, target, match_duplicates_by_distance=True
+        )
+        pairs = list(zip(transform.transform_source, transform.transform_target))
+        assert len(pairs) == 2
+        for source_group, target_group in pairs:
+            assert len(source_group) == len(target_group) == 1
+            sides = [
+                np.sign(group.get_x() - mob.get_x())
+                for group, mob in [(source_group, source), (target_group, target)]
+            ]
+            assert sides[0] == sides[1] != 0
+
+    def check_chain(self):
+        # Each step of a chain pairs the same parts as a TransformMatchingTexJ
+        # of its own, with every state keyed once, and takes overrides of
+        # the options it was built with
+        states = [
+            Tex("a", "+", "b"),
+            Tex("b", "+", "a"),
+            Tex("b", "-", "a", "+", "c"),
+        ]
+        chain = TransformMatchingChainJ(*states, key_maps={1: {"+": "-"}}, run_time=2)
+        assert len(chain) == 2
+        assert sorted(chain.shape_maps) == [0, 1, 2]
+        names = [
+            "transform_source",
+            "transform_target",
+            "key_mapped_source",
+            "key_mapped_target",
+            "fade_source",
+            "fade_target",
+        ]
+        for index in range(len(chain)):
+            step = chain[index]
+            single = TransformMatchingTexJ(
+                states[index], states[index + 1], **chain.get_step_config(index)
+            )
+            for name in names:
+                assert {frozenset(map(id, group)) for group in getattr(step, name)} == {
+                    frozenset(map(id, group)) for group in getattr(single, name)
+                }
+        assert len(chain[1].key_mapped_source) == 1
+        assert len(chain.step(1, key_map=dict()).key_mapped_source) == 0
+        assert chain.step(0, run_time=3).run_time == 3
+
+    def check_aligned_points_cache(self):
+        # The same pair of shapes somewhere else comes out of the cache with
+        # the points that aligning them again would give
+        ALIGNED_POINTS_CACHE.clear()
+        for shift in [ORIGIN, 2 * RIGHT + UP]:
+            source = Square().shift(shift)
+            target = Circle().shift(shift + DOWN)
+            cached = AlignCachedTransform(source.copy(), target.copy())
+            plain = Transform(source.copy(), target.copy())
+            cached.begin()
+            plain.begin()
+            assert len(ALIGNED_POINTS_CACHE) == 1
+            for mob1, mob2 in [
+                (cached.mobject, plain.mobject),
+                (cached.target_copy, plain.target_copy),
+            ]:
+                assert np.allclose(mob1.get_points(), mob2.get_points())